@@ -0,0 +1,79 @@
+"""
+Benchmark the vectorised cleanup steps against the previous per-cell code.
+
+    python benchmarks/bench_cleanup.py --rows 100000 --cols 10
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lead_automation.cleanup import _trim_strings, invalid_email_mask  # noqa: E402
+
+
+def _per_cell_trim(df: pd.DataFrame) -> pd.DataFrame:
+    return df.apply(lambda col: col.map(lambda v: v.strip() if isinstance(v, str) else v))
+
+
+def _per_cell_invalid(emails: pd.Series) -> pd.Series:
+    def invalid(value: object) -> bool:
+        email = str(value or "").strip()
+        return not email or "@" not in email
+
+    return emails.map(invalid).astype(bool)
+
+
+def make_frame(rows: int, cols: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = {"Email": [f"  user{i}@example.com " if i % 10 else f"user{i}.example.com" for i in range(rows)]}
+    for c in range(1, cols):
+        if c % 3 == 0:
+            data[f"col{c}"] = rng.integers(0, 1_000_000, rows)
+        else:
+            data[f"col{c}"] = [f" value {i % 977} " for i in range(rows)]
+    return pd.DataFrame(data)
+
+
+def _time(fn, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--cols", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    df = make_frame(args.rows, args.cols)
+
+    assert _per_cell_trim(df).equals(_trim_strings(df))
+    assert _per_cell_invalid(df["Email"]).equals(invalid_email_mask(df["Email"]))
+
+    for label, before, after, arg in (
+        ("trim", _per_cell_trim, _trim_strings, df),
+        ("email validity", _per_cell_invalid, invalid_email_mask, df["Email"]),
+    ):
+        t_before = _time(before, arg)
+        t_after = _time(after, arg)
+        print(
+            f"{label:>15}: per-cell {t_before * 1000:8.1f} ms, "
+            f"vectorised {t_after * 1000:8.1f} ms, speedup {t_before / t_after:5.1f}x "
+            f"({args.rows:,} rows x {args.cols} cols)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
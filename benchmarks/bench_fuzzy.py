@@ -0,0 +1,110 @@
+"""
+Time fuzzy duplicate detection (``FuzzyDedup``) on synthetic people at
+increasing sizes, to show that blocking keeps it near-linear.
+
+    python benchmarks/bench_fuzzy.py --rows 10000 50000 100000 500000
+
+Each dataset has random names, phones and emails, plus a ``--dup-rate``
+share of near-duplicates: a copy of an earlier person with a typo in the
+name, a different email and, usually, the same phone. Reported per size:
+candidate pairs, seconds, microseconds per row, how many injected
+duplicates were found (recall) and how many leads were merged into a
+cluster of a different person (false merges).
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lead_automation.fuzzy import FuzzyDedup  # noqa: E402
+
+FREE_MAIL = ("gmail.com", "yahoo.com", "outlook.com", "hotmail.com")
+_SYLLABLES = ("an", "ber", "cal", "dor", "el", "fin", "gar", "hol", "is", "jen", "kar", "lo", "mar", "nor", "ol",
+              "per", "quin", "ros", "sam", "tor", "ul", "ven", "wil", "xan", "yor", "zel")
+
+
+def _words(rng: np.random.Generator, count: int, syllables: int) -> np.ndarray:
+    parts = rng.choice(_SYLLABLES, size=(count, syllables))
+    return np.array(["".join(row).capitalize() for row in parts])
+
+
+def _typo(rng: np.random.Generator, name: str) -> str:
+    i = int(rng.integers(1, len(name) - 1))
+    if rng.random() < 0.5:
+        return name[:i] + name[i + 1:]
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+def make_people(rows: int, dup_rate: float, seed: int) -> tuple[pd.DataFrame, np.ndarray]:
+    """
+    The leads and, per row, the id of the person it belongs to.
+    """
+    rng = np.random.default_rng(seed)
+    first = _words(rng, 2_000, 2)
+    last = _words(rng, 20_000, 3)
+    domains = np.array([f"{w.lower()}.com" for w in _words(rng, max(rows // 20, 10), 3)])
+
+    f = first[rng.integers(0, len(first), rows)]
+    surname = last[rng.integers(0, len(last), rows)]
+    names = np.char.add(np.char.add(f, " "), surname)
+    domain = np.where(
+        rng.random(rows) < 0.3,
+        rng.choice(FREE_MAIL, rows),
+        domains[rng.integers(0, len(domains), rows)],
+    )
+    local = np.char.add(np.char.lower(np.char.add(np.char.add(f, "."), surname)), np.arange(rows).astype(str))
+    emails = np.char.add(np.char.add(local, "@"), domain)
+    phones = np.array([f"({a}) {b}-{c:04d}" for a, b, c in rng.integers([200, 200, 0], [999, 999, 9999], (rows, 3))])
+    people = np.arange(rows)
+    # Object arrays, so the edits below are not cut to the fixed width
+    names, emails, phones = names.astype(object), emails.astype(object), phones.astype(object)
+
+    duplicate = rng.random(rows) < dup_rate
+    duplicate[0] = False
+    for i in np.flatnonzero(duplicate):
+        j = int(rng.integers(0, i))
+        people[i] = people[j]
+        names[i] = _typo(rng, names[j])
+        emails[i] = f"{names[j][0].lower()}{surname[j].lower()}@{rng.choice(FREE_MAIL)}"
+        phones[i] = phones[j] if rng.random() < 0.8 else f"+1 {phones[j]}"
+    df = pd.DataFrame({"Name": names, "Email": emails, "Phone": phones})
+    return df, people
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000, 100_000, 500_000])
+    parser.add_argument("--dup-rate", type=float, default=0.05)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--max-block-size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    fuzzy = FuzzyDedup(threshold=args.threshold, max_block_size=args.max_block_size)
+    print(f"{'rows':>10} {'pairs':>11} {'seconds':>9} {'us/row':>8} {'recall':>8} {'false merges':>13}")
+    for rows in args.rows:
+        df, people = make_people(rows, args.dup_rate, args.seed)
+        start = time.perf_counter()
+        labels = fuzzy.clusters(df)
+        seconds = time.perf_counter() - start
+        pairs = len(fuzzy.candidate_pairs(df)[0])
+
+        injected = people != np.arange(rows)
+        found = labels != np.arange(rows)
+        recall = (found & injected & (people[labels] == people)).sum() / max(injected.sum(), 1)
+        false_merges = int((people[labels] != people).sum())
+        print(
+            f"{rows:>10,} {pairs:>11,} {seconds:>9.2f} {seconds / rows * 1e6:>8.1f} "
+            f"{recall:>8.1%} {false_merges:>13,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
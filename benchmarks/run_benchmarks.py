@@ -0,0 +1,191 @@
+"""
+Time the pipeline stages on synthetic datasets of increasing size and
+write the results as JSON, optionally comparing them with an earlier run.
+
+    python benchmarks/run_benchmarks.py --rows 1000 100000 1000000 \\
+        --crm-latency 0 0.002 --output results.json --baseline previous.json
+
+For every size a dataset is generated (``generate_sample_leads``), then a
+full ``run_pipeline`` is timed: ``clean_leads`` (with its read, clean,
+dedup and write stages), the dispatch loop and, separately,
+``write_report``. Logging runs at INFO into a null handler, so the cost of
+building log records is included but not console I/O. With
+``--baseline``, stages more than ``--max-regression`` times slower than
+the baseline are listed and the exit code is 1.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from generate_sample_leads import generate_leads  # noqa: E402
+from lead_automation.crm import MockCRMClient  # noqa: E402
+from lead_automation.emailer import MockEmailClient  # noqa: E402
+from lead_automation.outputs import CLEANED_FORMATS, write_cleaned  # noqa: E402
+from lead_automation.pipeline import run_pipeline  # noqa: E402
+from lead_automation.reporting import write_report  # noqa: E402
+
+# Stages faster than this in the baseline are too noisy to compare.
+MIN_COMPARABLE_SECONDS = 0.05
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _best_of(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_size(rows: int, args: argparse.Namespace, workdir: Path) -> Dict[str, Any]:
+    start = time.perf_counter()
+    df = generate_leads(
+        rows,
+        duplicate_rate=args.duplicate_rate,
+        missing_email_rate=args.missing_email_rate,
+        fail_rate=args.fail_rate,
+        bounce_rate=args.bounce_rate,
+        extra_columns=args.extra_columns,
+        seed=args.seed,
+    )
+    input_path = workdir / f"leads_{rows}.{args.input_format}"
+    write_cleaned(df, input_path, args.input_format)
+    generate_seconds = time.perf_counter() - start
+    del df
+
+    cleaned_path = None if args.cleaned_format == "none" else workdir / f"cleaned_{rows}.{args.cleaned_format}"
+    report_path = workdir / f"report_{rows}.json"
+    stats = run_pipeline(
+        input_excel=input_path,
+        cleaned_excel=cleaned_path,
+        report_path=report_path,
+        crm_client=MockCRMClient(min_latency=args.crm_latency[0], max_latency=args.crm_latency[1]),
+        email_client=MockEmailClient(min_latency=args.email_latency[0], max_latency=args.email_latency[1]),
+        workers=args.workers,
+        batch_size=args.batch_size,
+    )
+
+    timings = stats.timings
+    stages = {"cleanup": timings.stage_seconds.get("cleanup", 0.0)}
+    stages.update({f"cleanup_{name}": seconds for name, seconds in stats.cleanup.stage_seconds.items()})
+    stages["dispatch"] = timings.stage_seconds.get("dispatch", 0.0)
+    stages["write_report"] = _best_of(lambda: write_report(stats, report_path))
+
+    dispatch_seconds = stages["dispatch"]
+    return {
+        "rows": rows,
+        "leads_dispatched": timings.leads_dispatched,
+        "generate_seconds": round(generate_seconds, 4),
+        "stage_seconds": {name: round(seconds, 4) for name, seconds in stages.items()},
+        "throughput_leads_per_second": round(timings.leads_dispatched / dispatch_seconds, 1) if dispatch_seconds else 0.0,
+        "crm_latency": timings.crm.summary(),
+        "email_latency": timings.email.summary(),
+        "counts": stats.to_dict(),
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """
+    Stages (per size) that got more than ``max_regression`` times slower.
+    """
+    previous = {run["rows"]: run["stage_seconds"] for run in baseline.get("results", [])}
+    regressions = []
+    for run in results:
+        before = previous.get(run["rows"])
+        if before is None:
+            continue
+        for stage, seconds in run["stage_seconds"].items():
+            old = before.get(stage)
+            if old is None or old < MIN_COMPARABLE_SECONDS:
+                continue
+            ratio = seconds / old
+            print(f"{run['rows']:>10,} rows {stage:>16}: {old:9.3f}s -> {seconds:9.3f}s ({ratio:5.2f}x)")
+            if ratio > max_regression:
+                regressions.append(f"{run['rows']} rows / {stage}: {old:.3f}s -> {seconds:.3f}s ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--input-format", choices=CLEANED_FORMATS, default="csv")
+    parser.add_argument("--cleaned-format", choices=CLEANED_FORMATS + ("none",), default="csv")
+    parser.add_argument("--crm-latency", type=float, nargs=2, default=[0.0, 0.0], metavar=("MIN", "MAX"))
+    parser.add_argument("--email-latency", type=float, nargs=2, default=[0.0, 0.0], metavar=("MIN", "MAX"))
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--duplicate-rate", type=float, default=0.05)
+    parser.add_argument("--missing-email-rate", type=float, default=0.02)
+    parser.add_argument("--fail-rate", type=float, default=0.01)
+    parser.add_argument("--bounce-rate", type=float, default=0.01)
+    parser.add_argument("--extra-columns", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    parser.add_argument("--baseline", type=Path, default=None, help="Earlier results file to compare against.")
+    parser.add_argument("--max-regression", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()], force=True)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="lead-bench-") as tmp:
+        for rows in args.rows:
+            run = bench_size(rows, args, Path(tmp))
+            stages = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in run["stage_seconds"].items())
+            print(f"{rows:>10,} rows: {stages}; {run['throughput_leads_per_second']:,.0f} leads/s dispatched")
+            results.append(run)
+
+    document = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(document, indent=2), encoding="utf-8")
+    print(f"Results written to {args.output}")
+
+    if args.baseline is not None:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.max_regression)
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
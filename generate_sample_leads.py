@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
 
+import numpy as np
 import pandas as pd
 
+from lead_automation.outputs import CLEANED_FORMATS, write_cleaned
 
-def create_sample_leads(path: str = "leads.xlsx") -> None:
+SOURCES = ("Website", "Referral", "Event", "Ad Campaign", "Partner")
+
+
+def _fixed_sample() -> pd.DataFrame:
     today = datetime.today().strftime("%Y-%m-%d")
     data = [
         {
@@ -37,11 +44,125 @@ def create_sample_leads(path: str = "leads.xlsx") -> None:
             "Created Date": today,
         },
     ]
-    df = pd.DataFrame(data)
-    df.to_excel(path, index=False)
+    return pd.DataFrame(data)
+
+
+def generate_leads(
+    rows: int,
+    duplicate_rate: float = 0.0,
+    missing_email_rate: float = 0.0,
+    fail_rate: float = 0.0,
+    bounce_rate: float = 0.0,
+    extra_columns: int = 0,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Build ``rows`` synthetic leads, vectorised so millions of rows take
+    seconds.
+
+    A ``duplicate_rate`` share of rows repeat the email of an earlier row,
+    ``missing_email_rate`` of rows have no email, and ``fail_rate`` /
+    ``bounce_rate`` of addresses contain "fail" / "bounce", which the mock
+    CRM and email clients reject. ``extra_columns`` adds unused junk
+    columns. The same ``seed`` always gives the same frame.
+    """
+    rng = np.random.default_rng(seed)
+    ids = np.arange(rows)
+
+    # Duplicates copy the key of a random earlier original row, so the
+    # first occurrence is the one cleanup keeps.
+    duplicate = rng.random(rows) < duplicate_rate
+    if rows:
+        duplicate[0] = False
+    original = ~duplicate
+    originals_before = np.cumsum(original) - original
+    pick = (rng.random(rows) * originals_before).astype(np.int64)
+    keys = np.where(duplicate, np.flatnonzero(original)[pick], ids)
+
+    # Failing/bouncing is decided per key, so duplicates behave alike
+    kind = rng.random(rows)[keys]
+    suffix = np.select(
+        [kind < fail_rate, kind < fail_rate + bounce_rate],
+        ["_fail@example.com", "_bounce@example.com"],
+        "@example.com",
+    )
+    key_text = pd.Series(keys).astype(str)
+    emails = ("lead" + key_text + suffix).astype(object)
+    emails[rng.random(rows) < missing_email_rate] = None
+
+    start = datetime.today() - timedelta(days=30)
+    created = pd.Timestamp(start.date()) + pd.to_timedelta(rng.integers(0, 30, rows), unit="D")
+    data = {
+        "Name": "Lead " + key_text,
+        "Email": emails,
+        "Phone": "555-" + pd.Series(keys % 10_000).astype(str).str.zfill(4),
+        "Source": np.asarray(SOURCES, dtype=object)[rng.integers(0, len(SOURCES), rows)],
+        "Created Date": created.strftime("%Y-%m-%d"),
+    }
+    for i in range(extra_columns):
+        if i % 2:
+            data[f"Extra {i + 1}"] = rng.integers(0, 1_000_000, rows)
+        else:
+            data[f"Extra {i + 1}"] = "note " + pd.Series(rng.integers(0, 1000, rows)).astype(str)
+    return pd.DataFrame(data)
+
+
+def create_sample_leads(
+    path: str = "leads.xlsx",
+    rows: int | None = None,
+    output_format: str | None = None,
+    **options: float,
+) -> None:
+    """
+    Write sample leads to ``path``. Without ``rows`` this is the small
+    hand-written sample (one failing and one bouncing lead); with it, a
+    synthetic dataset from ``generate_leads`` (``options`` are passed on).
+    The format follows the extension unless ``output_format`` is given.
+    """
+    df = _fixed_sample() if rows is None else generate_leads(rows, **options)
+    write_cleaned(df, Path(path), output_format)
     print(f"Sample leads written to {path}")
 
 
-if __name__ == "__main__":
-    create_sample_leads()
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate sample leads files.")
+    parser.add_argument("--output", default="leads.xlsx", help="Output file (default: leads.xlsx).")
+    parser.add_argument(
+        "--format",
+        choices=CLEANED_FORMATS,
+        default=None,
+        help="Output format (default: from the --output extension).",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=None,
+        help="Generate this many synthetic rows instead of the 4-row hand-written sample.",
+    )
+    parser.add_argument("--duplicate-rate", type=float, default=0.05, help="Share of rows repeating an earlier email.")
+    parser.add_argument("--missing-email-rate", type=float, default=0.02, help="Share of rows without an email.")
+    parser.add_argument("--fail-rate", type=float, default=0.01, help="Share of addresses the mock CRM rejects.")
+    parser.add_argument("--bounce-rate", type=float, default=0.01, help="Share of addresses the mock email bounces.")
+    parser.add_argument("--extra-columns", type=int, default=0, help="Number of unused junk columns to add.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (same seed, same file).")
+    args = parser.parse_args(argv)
 
+    if args.rows is None:
+        create_sample_leads(args.output, output_format=args.format)
+        return 0
+    create_sample_leads(
+        args.output,
+        rows=args.rows,
+        output_format=args.format,
+        duplicate_rate=args.duplicate_rate,
+        missing_email_rate=args.missing_email_rate,
+        fail_rate=args.fail_rate,
+        bounce_rate=args.bounce_rate,
+        extra_columns=args.extra_columns,
+        seed=args.seed,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
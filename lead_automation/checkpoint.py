@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+import json
+import os
+import time
+
+from .reporting import PipelineStats
+
+
+@dataclass
+class Checkpoint:
+    """
+    Progress of an interrupted run: ``cursor`` cleaned leads have been
+    dispatched and recorded, and ``stats`` are the counts at that point.
+    """
+
+    input_path: str
+    cleaned_path: str | None
+    cleanup_complete: bool
+    cursor: int
+    stats: Dict[str, Any]
+    updated_at: float
+    # Format the cleaned output was written in, which need not match its
+    # extension; None in checkpoints written before it was recorded.
+    cleaned_format: str | None = None
+    # Leads the incremental state must leave out (transient CRM failures
+    # before the cursor), re-applied on resume.
+    incremental_discards: List[str] = field(default_factory=list)
+
+
+class Checkpointer:
+    """
+    Periodically persists a ``Checkpoint`` while leads are dispatched.
+
+    A checkpoint is written every ``every_leads`` leads or ``every_seconds``
+    seconds, whichever comes first, by writing a temporary file and
+    renaming it over the old one, so a crash never leaves a torn file.
+    """
+
+    def __init__(self, path: Path, every_leads: int = 1000, every_seconds: float = 30.0) -> None:
+        self.path = path
+        self.every_leads = max(1, every_leads)
+        self.every_seconds = max(0.0, every_seconds)
+        self._input_path = ""
+        self._cleaned_path: str | None = None
+        self._cleaned_format: str | None = None
+        self._cleanup_complete = False
+        self._last_cursor = 0
+        self._last_saved = time.monotonic()
+
+    def load(self) -> Checkpoint | None:
+        if not self.path.exists():
+            return None
+        with self.path.open("r", encoding="utf-8") as f:
+            return Checkpoint(**json.load(f))
+
+    def begin(
+        self,
+        input_path: Path | str,
+        cleaned_path: Path | None,
+        cleanup_complete: bool,
+        cursor: int = 0,
+        cleaned_format: str | None = None,
+    ) -> None:
+        """
+        Set what this run is checkpointing. ``cleanup_complete`` means the
+        cleaned output on disk holds every cleaned lead, so a resume can
+        read it (as ``cleaned_format``) instead of cleaning the input again.
+        """
+        self._input_path = str(input_path)
+        self._cleaned_path = str(cleaned_path) if cleaned_path is not None else None
+        self._cleaned_format = cleaned_format
+        self._cleanup_complete = cleanup_complete
+        self._last_cursor = cursor
+
+    def maybe_save(self, cursor: int, stats: PipelineStats, incremental_discards: Iterable[str] = ()) -> None:
+        now = time.monotonic()
+        if cursor - self._last_cursor >= self.every_leads or now - self._last_saved >= self.every_seconds:
+            self.save(cursor, stats, incremental_discards)
+
+    def save(self, cursor: int, stats: PipelineStats, incremental_discards: Iterable[str] = ()) -> None:
+        checkpoint = Checkpoint(
+            input_path=self._input_path,
+            cleaned_path=self._cleaned_path,
+            cleanup_complete=self._cleanup_complete,
+            cleaned_format=self._cleaned_format,
+            cursor=cursor,
+            stats=stats.to_state(),
+            updated_at=time.time(),
+            incremental_discards=sorted(incremental_discards),
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(asdict(checkpoint), f)
+        os.replace(tmp_path, self.path)
+        self._last_cursor = cursor
+        self._last_saved = time.monotonic()
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
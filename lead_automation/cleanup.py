@@ -1,67 +1,387 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Iterator, List, Sequence, Tuple
+import logging
+import os
 
 import pandas as pd
 
+from .columns import ColumnAliases, column_renames
+from .dedup import EmailDedupIndex
+from .ingest import DEFAULT_CHUNK_SIZE, iter_raw_chunks, list_sheets, read_leads
+from .normalise import DEFAULT_NORMALISER, LeadNormaliser, collapsed_duplicates
+from .outputs import open_chunk_writer, write_cleaned
+from .timing import timed, timed_iter
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class CleanupStats:
     total_raw_leads: int = 0
     leads_skipped_missing_email: int = 0
     duplicates_removed: int = 0
+    # Of those, duplicates only by canonical email key (case, Gmail dots,
+    # "+tag"), counted within each file or chunk.
+    duplicates_collapsed: int = 0
+    invalid_emails: int = 0
+    # Phone values rewritten to E.164.
+    phones_normalised: int = 0
+    # Cleaned leads left out by incremental mode as processed by earlier runs.
+    already_processed: int = 0
+    # Clusters of likely duplicates found by fuzzy dedup, and the leads in
+    # them beyond the first (dropped in "drop" mode).
+    fuzzy_clusters: int = 0
+    fuzzy_duplicates: int = 0
+    # Sheets of a multi-file run left out for having no Email column.
+    sheets_skipped: int = 0
+    # Wall-clock seconds spent reading, cleaning and writing.
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
 
     @property
     def leads_skipped(self) -> int:
         return self.leads_skipped_missing_email
 
+    def merge(self, other: "CleanupStats") -> None:
+        """
+        Add another file's (or sheet's) counts and stage times to these.
+        """
+        self.total_raw_leads += other.total_raw_leads
+        self.leads_skipped_missing_email += other.leads_skipped_missing_email
+        self.duplicates_removed += other.duplicates_removed
+        self.duplicates_collapsed += other.duplicates_collapsed
+        self.invalid_emails += other.invalid_emails
+        self.phones_normalised += other.phones_normalised
+        self.already_processed += other.already_processed
+        self.fuzzy_clusters += other.fuzzy_clusters
+        self.fuzzy_duplicates += other.fuzzy_duplicates
+        self.sheets_skipped += other.sheets_skipped
+        for name, seconds in other.stage_seconds.items():
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + seconds
 
-def _normalise_columns(df: pd.DataFrame) -> pd.DataFrame:
-    rename_map: Dict[str, str] = {}
-    for col in df.columns:
-        key = col.strip().lower()
-        if key in {"name"}:
-            rename_map[col] = "Name"
-        elif key in {"email", "e-mail"}:
-            rename_map[col] = "Email"
-        elif key in {"phone", "phone number", "mobile"}:
-            rename_map[col] = "Phone"
-        elif key in {"source"}:
-            rename_map[col] = "Source"
-        elif key in {"created date", "created_at", "created"}:
-            rename_map[col] = "Created Date"
+
+def _normalise_columns(df: pd.DataFrame, aliases: ColumnAliases | None = None) -> pd.DataFrame:
+    rename_map = column_renames(df.columns, aliases)
     if rename_map:
         df = df.rename(columns=rename_map)
     return df
 
 
-def clean_leads(input_path: Path, output_path: Path) -> Tuple[pd.DataFrame, CleanupStats]:
-    df = pd.read_excel(input_path)
-    df = _normalise_columns(df)
+def _trim_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Trim whitespace from all string cells, leaving other values untouched.
 
-    # Trim whitespace from all string-like cells in a way that works across
-    # pandas versions (some deprecate/remove DataFrame.applymap).
-    df = df.apply(lambda col: col.map(lambda v: v.strip() if isinstance(v, str) else v))
+    Only object/string columns can hold strings, and those are stripped
+    with the vectorised ``.str`` accessor. It returns NaN for non-string
+    cells in mixed columns, so those positions take back the original
+    value. Object columns then get the same dtype inference the previous
+    per-cell ``Series.map`` applied, so results are identical.
+    """
+    df = df.copy()
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        values = df[col]
+        try:
+            stripped = values.str.strip()
+            values = stripped.where(stripped.notna(), values)
+        except AttributeError:
+            # No string values in this column at all.
+            pass
+        if values.dtype == object:
+            values = values.infer_objects()
+        df[col] = values
+    return df
 
-    stats = CleanupStats()
-    stats.total_raw_leads = len(df)
 
+def invalid_email_mask(emails: pd.Series) -> pd.Series:
+    """
+    Vectorised version of the address check ``MockEmailClient`` applies
+    before sending: True where the email is missing, blank, or has no "@".
+    """
+    text = emails.astype("string").str.strip()
+    return (text.isna() | text.eq("") | ~text.str.contains("@", regex=False)).fillna(True).astype(bool)
+
+
+def _require_email_column(df: pd.DataFrame, label: str = "input leads file") -> None:
     if "Email" not in df.columns:
-        raise ValueError("Expected 'Email' column in input leads file.")
+        headers = ", ".join(repr(col) for col in df.columns)
+        raise ValueError(
+            f"Expected 'Email' column in {label}; found {headers or 'no columns'}. "
+            "Add the email header as an alias for Email."
+        )
+
 
+def _drop_missing_email(df: pd.DataFrame) -> pd.DataFrame:
     email_series = df["Email"].astype("string")
     has_email_mask = email_series.notna() & email_series.str.strip().ne("")
+    return df[has_email_mask]
+
+
+def _deduplicate(
+    df: pd.DataFrame,
+    stats: CleanupStats,
+    normaliser: LeadNormaliser,
+    dedup_index: EmailDedupIndex | None = None,
+) -> pd.DataFrame:
+    """
+    Drop rows whose email key was seen before, earlier in ``df`` or (with
+    a ``dedup_index``) in earlier chunks, files or runs, and count them.
+    """
+    keys = normaliser.email_keys(df["Email"])
+    if dedup_index is None:
+        df_dedup = df[~keys.duplicated(keep="first")]
+    else:
+        df_dedup = df[dedup_index.first_occurrences(keys)]
+    stats.duplicates_removed += len(df) - len(df_dedup)
+    if normaliser.canonical_emails:
+        stats.duplicates_collapsed += collapsed_duplicates(df["Email"], keys)
+    return df_dedup
+
+
+def clean_leads(
+    input_path: Path,
+    output_path: Path | None,
+    dedup_index: EmailDedupIndex | None = None,
+    output_format: str | None = None,
+    project_columns: bool = False,
+    column_aliases: ColumnAliases | None = None,
+    normaliser: LeadNormaliser | None = None,
+) -> Tuple[pd.DataFrame, CleanupStats]:
+    """
+    Load, clean and deduplicate a leads workbook, and write the cleaned copy.
+
+    Pass a shared ``dedup_index`` to also drop emails seen in earlier files
+    or runs; otherwise duplicates are only removed within this file. The
+    cleaned copy's format follows ``output_format`` or the extension of
+    ``output_path`` (see ``outputs.resolve_format``); with no
+    ``output_path`` nothing is written. ``project_columns`` loads only the
+    recognised lead columns and drops everything else, including from the
+    cleaned copy. Headers are matched to the lead columns by
+    ``column_aliases`` (default: the built-in aliases).
+
+    Duplicates are found by the email keys of ``normaliser`` (default:
+    canonical keys, see ``normalise.canonical_email_keys``), which may
+    also rewrite phone numbers to E.164.
+    """
+    normaliser = normaliser or DEFAULT_NORMALISER
+    stats = CleanupStats()
+    stages = stats.stage_seconds
+
+    with timed(stages, "read"):
+        df = read_leads(input_path, project=project_columns, aliases=column_aliases)
+
+    with timed(stages, "clean"):
+        df = _normalise_columns(df, column_aliases)
+        df = _trim_strings(df)
+        stats.total_raw_leads = len(df)
+
+        _require_email_column(df)
+
+        df_with_email = _drop_missing_email(df).copy()
+        stats.leads_skipped_missing_email = stats.total_raw_leads - len(df_with_email)
+        df_with_email, stats.phones_normalised = normaliser.normalise_phones(df_with_email)
+
+    with timed(stages, "dedup"):
+        df_dedup = _deduplicate(df_with_email, stats, normaliser, dedup_index)
+        stats.invalid_emails = int(invalid_email_mask(df_dedup["Email"]).sum())
+
+    if output_path is not None:
+        with timed(stages, "write"):
+            write_cleaned(df_dedup, output_path, output_format)
+
+    return df_dedup, stats
+
+
+def stream_clean_leads(
+    input_path: Path,
+    output_path: Path | None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dedup_index: EmailDedupIndex | None = None,
+    output_format: str | None = None,
+    project_columns: bool = False,
+    column_aliases: ColumnAliases | None = None,
+    normaliser: LeadNormaliser | None = None,
+) -> Tuple[Iterator[pd.DataFrame], CleanupStats]:
+    """
+    Streaming counterpart of ``clean_leads``.
+
+    Returns an iterator of cleaned chunks and a ``CleanupStats`` that fills
+    in as the iterator is consumed. Input is read ``chunk_size`` rows at a
+    time, headers are resolved once from the first chunk, and each cleaned
+    chunk is appended to ``output_path`` (if given) before it is yielded.
+    Duplicates are removed across chunks (first occurrence wins), matching
+    ``clean_leads``; pass a shared ``dedup_index`` to dedupe across files
+    or runs as well. ``normaliser`` works as in ``clean_leads``.
+    """
+    normaliser = normaliser or DEFAULT_NORMALISER
+    stats = CleanupStats()
+    stages = stats.stage_seconds
+    index = dedup_index if dedup_index is not None else EmailDedupIndex()
+
+    def chunks() -> Iterator[pd.DataFrame]:
+        rename_map: Dict[str, str] | None = None
+        writer = open_chunk_writer(output_path, output_format) if output_path is not None else None
+        try:
+            raw_chunks = iter_raw_chunks(input_path, chunk_size, project_columns, column_aliases)
+            for raw in timed_iter(raw_chunks, stages, "read"):
+                with timed(stages, "clean"):
+                    if rename_map is None:
+                        rename_map = column_renames(raw.columns, column_aliases)
+                        _require_email_column(raw.rename(columns=rename_map))
+                    df = _trim_strings(raw.rename(columns=rename_map))
+                    stats.total_raw_leads += len(df)
+
+                    df_with_email = _drop_missing_email(df)
+                    stats.leads_skipped_missing_email += len(df) - len(df_with_email)
+                    df_with_email, phones = normaliser.normalise_phones(df_with_email)
+                    stats.phones_normalised += phones
+
+                with timed(stages, "dedup"):
+                    df_dedup = _deduplicate(df_with_email, stats, normaliser, index)
+                    stats.invalid_emails += int(invalid_email_mask(df_dedup["Email"]).sum())
+
+                if writer is not None:
+                    with timed(stages, "write"):
+                        writer.write(df_dedup)
+                if len(df_dedup):
+                    yield df_dedup
+        finally:
+            if writer is not None:
+                writer.close()
+
+    return chunks(), stats
+
+
+@dataclass(frozen=True)
+class InputPart:
+    """
+    One table to clean: a sheet of a workbook, or a whole CSV/Parquet/
+    Feather file (``sheet`` None).
+    """
+
+    path: Path
+    sheet: str | None = None
+
+    @property
+    def label(self) -> str:
+        return str(self.path) if self.sheet is None else f"{self.path} [{self.sheet}]"
+
+
+def input_parts(paths: Sequence[Path]) -> List[InputPart]:
+    """
+    Every sheet of every input, in file then sheet order.
+    """
+    parts: List[InputPart] = []
+    for path in paths:
+        if not path.exists():
+            raise FileNotFoundError(path)
+        parts.extend(InputPart(path, sheet) for sheet in list_sheets(path))
+    return parts
+
+
+def _clean_part(
+    part: InputPart,
+    project_columns: bool,
+    column_aliases: ColumnAliases | None = None,
+    normaliser: LeadNormaliser = DEFAULT_NORMALISER,
+) -> Tuple[pd.DataFrame, CleanupStats]:
+    """
+    Read and clean one part in a worker process.
+
+    Duplicates within the part are dropped here already (first occurrence
+    wins, as in the global pass), which keeps what is sent back to the
+    parent small. A part without an Email column (a notes or lookup sheet)
+    comes back empty and counted in ``sheets_skipped``.
+    """
+    stats = CleanupStats()
+    df = read_leads(part.path, project=project_columns, sheet=part.sheet, aliases=column_aliases)
+    if len(df.columns) == 0:
+        # Blank sheet
+        return df, stats
+
+    df = _trim_strings(_normalise_columns(df, column_aliases))
+    if "Email" not in df.columns:
+        stats.sheets_skipped = 1
+        return pd.DataFrame(), stats
+    stats.total_raw_leads = len(df)
+
+    df_with_email = _drop_missing_email(df)
+    stats.leads_skipped_missing_email = len(df) - len(df_with_email)
+    df_with_email, stats.phones_normalised = normaliser.normalise_phones(df_with_email)
+
+    return _deduplicate(df_with_email, stats, normaliser), stats
+
+
+def _clean_parts(
+    parts: Sequence[InputPart],
+    project_columns: bool,
+    workers: int | None,
+    column_aliases: ColumnAliases | None = None,
+    normaliser: LeadNormaliser = DEFAULT_NORMALISER,
+) -> List[Tuple[pd.DataFrame, CleanupStats]]:
+    workers = min(workers or os.cpu_count() or 1, len(parts))
+    if workers <= 1:
+        return [_clean_part(part, project_columns, column_aliases, normaliser) for part in parts]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(_clean_part, parts, repeat(project_columns), repeat(column_aliases), repeat(normaliser))
+        )
+
+
+def clean_many_leads(
+    input_paths: Sequence[Path],
+    output_path: Path | None,
+    workers: int | None = None,
+    dedup_index: EmailDedupIndex | None = None,
+    output_format: str | None = None,
+    project_columns: bool = False,
+    column_aliases: ColumnAliases | None = None,
+    normaliser: LeadNormaliser | None = None,
+) -> Tuple[pd.DataFrame, CleanupStats]:
+    """
+    Multi-input counterpart of ``clean_leads``: every sheet of every file
+    is read and cleaned in parallel on a pool of ``workers`` processes
+    (default: one per CPU), since parsing Excel is CPU-bound.
+
+    Per-part counts are merged into one ``CleanupStats`` and email dedup
+    then runs over the merged leads, so the first occurrence in file,
+    sheet and row order wins across all inputs. Sheets without an Email
+    column are skipped with a warning. The merged leads are written to
+    ``output_path`` as in ``clean_leads``.
+    """
+    normaliser = normaliser or DEFAULT_NORMALISER
+    parts = input_parts(input_paths)
+    if not parts:
+        raise ValueError("No input files to clean.")
+
+    stats = CleanupStats()
+    with timed(stats.stage_seconds, "parse"):
+        results = _clean_parts(parts, project_columns, workers, column_aliases, normaliser)
 
-    df_with_email = df[has_email_mask].copy()
-    stats.leads_skipped_missing_email = stats.total_raw_leads - len(df_with_email)
+    frames = []
+    for part, (df, part_stats) in zip(parts, results):
+        stats.merge(part_stats)
+        if part_stats.sheets_skipped:
+            # Logged here, since worker processes do not share the log queue
+            logger.warning("Skipping %s: no Email column", part.label, extra={"sheet": part.label})
+        if len(df.columns):
+            frames.append(df)
+    if not frames:
+        raise ValueError(
+            "Expected 'Email' column in at least one sheet of the input files. "
+            "Add the email header as an alias for Email."
+        )
 
-    before_dedup = len(df_with_email)
-    df_dedup = df_with_email.drop_duplicates(subset=["Email"], keep="first")
-    stats.duplicates_removed = before_dedup - len(df_dedup)
+    with timed(stats.stage_seconds, "dedup"):
+        merged = pd.concat(frames, ignore_index=True)
+        df_dedup = _deduplicate(merged, stats, normaliser, dedup_index)
+        stats.invalid_emails = int(invalid_email_mask(df_dedup["Email"]).sum())
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    df_dedup.to_excel(output_path, index=False)
+    if output_path is not None:
+        with timed(stats.stage_seconds, "write"):
+            write_cleaned(df_dedup, output_path, output_format)
 
     return df_dedup, stats
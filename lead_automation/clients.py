@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import List, Protocol, Sequence, runtime_checkable
+
+from .crm import CRMResult
+from .emailer import EmailResult
+from .leads import Lead
+
+
+@runtime_checkable
+class CRMClient(Protocol):
+    """
+    Interface every CRM integration implements.
+
+    The mock client and real REST adapters expose both blocking calls,
+    used by ``run_pipeline``, and async ones, used by
+    ``run_pipeline_async``. Failures are returned as results, never raised.
+    """
+
+    def send_lead(self, lead: Lead) -> CRMResult:
+        ...
+
+    async def send_lead_async(self, lead: Lead) -> CRMResult:
+        ...
+
+    def send_leads(self, batch: Sequence[Lead]) -> List[CRMResult]:
+        """
+        Bulk insert; returns one result per lead, in input order.
+        """
+        ...
+
+    async def send_leads_async(self, batch: Sequence[Lead]) -> List[CRMResult]:
+        ...
+
+
+@runtime_checkable
+class EmailClient(Protocol):
+    """
+    Interface every email integration implements (mock, SMTP, HTTP API).
+    """
+
+    def send_welcome_email(self, lead: Lead) -> EmailResult:
+        ...
+
+    async def send_welcome_email_async(self, lead: Lead) -> EmailResult:
+        ...
+
+    def send_welcome_emails(self, batch: Sequence[Lead]) -> List[EmailResult]:
+        """
+        Send a batch of welcome emails (e.g. over one connection); returns
+        one result per lead, in input order.
+        """
+        ...
+
+    async def send_welcome_emails_async(self, batch: Sequence[Lead]) -> List[EmailResult]:
+        ...
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from difflib import get_close_matches
+from pathlib import Path
+from typing import Any, Dict, Iterable, Sequence, Tuple
+import json
+import re
+import unicodedata
+
+
+CANONICAL_COLUMNS: Tuple[str, ...] = ("Name", "Email", "Phone", "Source", "Created Date")
+
+# Header variants seen in vendor exports, per canonical column. They are
+# compared folded (see ``fold_header``), so "E-Mail" and "e_mail" both
+# match "email".
+DEFAULT_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "Name": (
+        "name", "full name", "contact name", "lead name", "customer name",
+        "nombre", "nom", "nome", "naam",
+    ),
+    "Email": (
+        "email", "e-mail", "email address", "e-mail address", "mail", "email id", "contact email",
+        "correo", "correo electronico", "courriel", "adresse e-mail", "e-mail-adresse", "endereco de email",
+    ),
+    "Phone": (
+        "phone", "phone number", "phone no", "mobile", "mobile no", "mobile number", "mobile phone",
+        "cell", "cell phone", "telephone", "tel", "contact number",
+        "telefono", "telefon", "telefonnummer", "numero de telephone", "celular", "movil",
+    ),
+    "Source": (
+        "source", "lead source", "lead origin", "origin", "channel", "campaign source",
+        "fuente", "origen", "quelle", "origine", "canal",
+    ),
+    "Created Date": (
+        "created date", "created_at", "created", "created on", "date created", "creation date",
+        "signup date", "fecha de creacion", "erstellt am", "date de creation",
+    ),
+}
+
+# ``difflib`` ratio a header needs to be taken for an alias it does not
+# match exactly, when fuzzy matching is on.
+DEFAULT_FUZZY_CUTOFF = 0.85
+
+_NOT_ALPHANUMERIC = re.compile(r"[\W_]+")
+
+
+def fold_header(header: str) -> str:
+    """
+    Lookup key for a header: accents, case, punctuation and whitespace
+    removed ("Mobile No." -> "mobileno", "Téléphone" -> "telephone").
+    """
+    decomposed = unicodedata.normalize("NFKD", header)
+    without_accents = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NOT_ALPHANUMERIC.sub("", without_accents.casefold())
+
+
+class ColumnAliases:
+    """
+    Resolves raw headers to the canonical column names.
+
+    The aliases are compiled into one dict from folded alias to canonical
+    name, so resolving a header is a single lookup. With ``fuzzy_cutoff``
+    set, headers without an exact match are compared against all aliases
+    with ``difflib`` and take the closest one scoring at least the cutoff.
+    Each canonical column is taken by at most one header, exact matches
+    first, so a second "E-mail" column cannot shadow "Email".
+    Resolutions are cached per header signature (the tuple of headers),
+    since a feed sends the same header row over and over.
+    """
+
+    def __init__(
+        self,
+        aliases: Dict[str, Iterable[str]] | None = None,
+        fuzzy_cutoff: float | None = None,
+    ) -> None:
+        if fuzzy_cutoff is not None and not 0 < fuzzy_cutoff <= 1:
+            raise ValueError("fuzzy_cutoff must be in (0, 1].")
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._lookup: Dict[str, str] = {}
+        for canonical, names in (DEFAULT_ALIASES if aliases is None else aliases).items():
+            if canonical not in CANONICAL_COLUMNS:
+                raise ValueError(
+                    f"Unknown column {canonical!r} in aliases; expected one of {', '.join(CANONICAL_COLUMNS)}."
+                )
+            # The canonical name always resolves to itself
+            for name in (canonical, *names):
+                key = fold_header(name)
+                claimed = self._lookup.setdefault(key, canonical)
+                if claimed != canonical:
+                    raise ValueError(f"Alias {name!r} is given for both {claimed!r} and {canonical!r}.")
+        self._keys = list(self._lookup)
+        self._cache: Dict[Tuple[Any, ...], Dict[str, str]] = {}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], fuzzy_cutoff: float | None = None) -> "ColumnAliases":
+        """
+        Build from ``{"Email": ["Courriel", "Mail Address"], ...}``; the
+        aliases are added to the built-in ones.
+        """
+        merged = {canonical: list(names) for canonical, names in DEFAULT_ALIASES.items()}
+        for canonical, names in data.items():
+            merged.setdefault(canonical, []).extend([names] if isinstance(names, str) else names)
+        return cls(merged, fuzzy_cutoff)
+
+    @classmethod
+    def load(cls, path: Path, fuzzy_cutoff: float | None = None) -> "ColumnAliases":
+        with path.open("r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f), fuzzy_cutoff)
+
+    def resolve(self, columns: Sequence[Any]) -> Dict[str, str]:
+        """
+        Map raw header names to canonical column names. Non-string and
+        unrecognised headers are left out of the mapping.
+        """
+        signature = tuple(columns)
+        renames = self._cache.get(signature)
+        if renames is None:
+            renames = self._resolve(signature)
+            self._cache[signature] = renames
+        return dict(renames)
+
+    def _resolve(self, columns: Tuple[Any, ...]) -> Dict[str, str]:
+        matched: Dict[str, str] = {}
+        unmatched = []
+        for col in columns:
+            if not isinstance(col, str):
+                continue
+            key = fold_header(col)
+            canonical = self._lookup.get(key)
+            if canonical is not None:
+                matched[col] = canonical
+            elif key and self.fuzzy_cutoff is not None:
+                unmatched.append((col, key))
+
+        # One header per canonical column: the one spelled exactly like it,
+        # else the first; the others keep their raw names.
+        renames: Dict[str, str] = {}
+        claimed = set()
+        for col, canonical in sorted(matched.items(), key=lambda item: item[0] != item[1]):
+            if canonical not in claimed:
+                renames[col] = canonical
+                claimed.add(canonical)
+        for col, key in unmatched:
+            match = get_close_matches(key, self._keys, n=1, cutoff=self.fuzzy_cutoff)
+            if match and self._lookup[match[0]] not in claimed:
+                renames[col] = self._lookup[match[0]]
+                claimed.add(renames[col])
+        return renames
+
+
+DEFAULT_COLUMN_ALIASES = ColumnAliases()
+
+
+def column_renames(columns: Iterable[Any], aliases: ColumnAliases | None = None) -> Dict[str, str]:
+    """
+    Map raw header names to the canonical column names the pipeline uses,
+    using ``aliases`` (default: the built-in aliases, no fuzzy matching).
+    Headers that are not recognised are left out of the mapping.
+    """
+    return (aliases or DEFAULT_COLUMN_ALIASES).resolve(list(columns))
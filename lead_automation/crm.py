@@ -1,16 +1,25 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, List, Sequence
+import asyncio
 import random
 import time
 
+from .leads import Lead
+
 
 @dataclass
 class CRMResult:
     success: bool
     message: str
     payload: Dict[str, Any] | None = None
+    # Transient failures (timeouts, 5xx, throttling) may succeed if retried;
+    # rejections of the lead itself may not.
+    retryable: bool = False
+    attempts: int = 1
+    # ``Lead.index`` of the lead this result is for.
+    lead_index: int | None = None
 
 
 class MockCRMClient:
@@ -27,26 +36,64 @@ class MockCRMClient:
         self.min_latency = max(0.0, min_latency)
         self.max_latency = max(self.min_latency, max_latency)
 
-    def send_lead(self, lead: Dict[str, Any]) -> CRMResult:
+    def send_lead(self, lead: Lead) -> CRMResult:
         """
         "Send" a single lead to the CRM.
 
         Rules:
-        - If email contains the word 'fail', this lead fails.
-        - Otherwise, the optional failure_rate introduces random failures.
+        - If email contains the word 'fail', this lead fails permanently.
+        - Otherwise, the optional failure_rate introduces random, retryable
+          failures.
         - Simulated latency is added if configured.
         """
-        email = str(lead.get("Email", "") or "")
+        delay = self._latency()
+        if delay > 0.0:
+            time.sleep(delay)
+        return self._evaluate(lead)
 
-        if self.max_latency > 0.0:
-            delay = random.uniform(self.min_latency, self.max_latency)
+    async def send_lead_async(self, lead: Lead) -> CRMResult:
+        """
+        Async counterpart of ``send_lead``; latency is simulated with
+        ``asyncio.sleep`` so many calls can be in flight on one thread.
+        """
+        delay = self._latency()
+        if delay > 0.0:
+            await asyncio.sleep(delay)
+        return self._evaluate(lead)
+
+    def send_leads(self, batch: Sequence[Lead]) -> List[CRMResult]:
+        """
+        "Send" a batch of leads through a bulk upsert endpoint.
+
+        Latency is simulated once for the whole batch. Each lead gets its
+        own result in input order, using the same rules as ``send_lead``,
+        so one bad lead only fails itself.
+        """
+        delay = self._latency()
+        if delay > 0.0:
             time.sleep(delay)
+        return [self._evaluate(lead) for lead in batch]
+
+    async def send_leads_async(self, batch: Sequence[Lead]) -> List[CRMResult]:
+        delay = self._latency()
+        if delay > 0.0:
+            await asyncio.sleep(delay)
+        return [self._evaluate(lead) for lead in batch]
+
+    def _latency(self) -> float:
+        if self.max_latency > 0.0:
+            return random.uniform(self.min_latency, self.max_latency)
+        return 0.0
+
+    def _evaluate(self, lead: Lead) -> CRMResult:
+        email = str(lead.get("Email", "") or "")
 
         if "fail" in email.lower():
-            return CRMResult(success=False, message="Email flagged as failing test case.", payload={"lead": lead})
+            return CRMResult(success=False, message="Email flagged as failing test case.", lead_index=lead.index)
 
         if self.failure_rate > 0.0 and random.random() < self.failure_rate:
-            return CRMResult(success=False, message="Random simulated CRM failure.", payload={"lead": lead})
-
-        return CRMResult(success=True, message="Lead successfully stored in CRM.", payload={"lead": lead})
+            return CRMResult(
+                success=False, message="Random simulated CRM failure.", retryable=True, lead_index=lead.index
+            )
 
+        return CRMResult(success=True, message="Lead successfully stored in CRM.", lead_index=lead.index)
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, List, Sequence
+import asyncio
 import logging
+import random
+import time
+
+from .leads import Lead
+from .templates import TemplateSet
 
 
 @dataclass
@@ -10,6 +16,9 @@ class EmailResult:
     success: bool
     message: str
     payload: Dict[str, Any] | None = None
+    retryable: bool = False
+    attempts: int = 1
+    lead_index: int | None = None
 
 
 class MockEmailClient:
@@ -18,26 +27,75 @@ class MockEmailClient:
 
     For the purposes of this assignment we log the email instead of
     really sending it. Failures are simulated for obviously invalid
-    addresses or test patterns.
+    addresses or test patterns. Messages are rendered from ``templates``
+    (per-Source variants of the welcome email). An optional latency
+    simulates the round trip of a real provider, as in ``MockCRMClient``.
+    Each "sent" email is logged at ``log_level`` (DEBUG when the pipeline
+    samples its per-lead logging).
     """
 
-    def __init__(self, logger: logging.Logger | None = None) -> None:
+    def __init__(
+        self,
+        logger: logging.Logger | None = None,
+        min_latency: float = 0.0,
+        max_latency: float = 0.0,
+        templates: TemplateSet | None = None,
+        log_level: int = logging.INFO,
+    ) -> None:
         self._logger = logger or logging.getLogger(__name__)
+        self.log_level = log_level
+        self.templates = templates or TemplateSet()
+        self.min_latency = max(0.0, min_latency)
+        self.max_latency = max(self.min_latency, max_latency)
+
+    def send_welcome_email(self, lead: Lead) -> EmailResult:
+        delay = self._latency()
+        if delay > 0.0:
+            time.sleep(delay)
+        return self._send(lead)
+
+    async def send_welcome_email_async(self, lead: Lead) -> EmailResult:
+        delay = self._latency()
+        if delay > 0.0:
+            await asyncio.sleep(delay)
+        return self._send(lead)
+
+    def send_welcome_emails(self, batch: Sequence[Lead]) -> List[EmailResult]:
+        """
+        Send a batch of welcome emails in one go (latency is simulated once,
+        like a batch over one connection); one result per lead, in order.
+        """
+        delay = self._latency()
+        if delay > 0.0:
+            time.sleep(delay)
+        return [self._send(lead) for lead in batch]
 
-    def send_welcome_email(self, lead: Dict[str, Any]) -> EmailResult:
-        name = str(lead.get("Name", "") or "").strip() or "there"
+    async def send_welcome_emails_async(self, batch: Sequence[Lead]) -> List[EmailResult]:
+        delay = self._latency()
+        if delay > 0.0:
+            await asyncio.sleep(delay)
+        return [self._send(lead) for lead in batch]
+
+    def _latency(self) -> float:
+        if self.max_latency > 0.0:
+            return random.uniform(self.min_latency, self.max_latency)
+        return 0.0
+
+    def _send(self, lead: Lead) -> EmailResult:
         email = str(lead.get("Email", "") or "").strip()
 
         if not email or "@" not in email:
-            return EmailResult(success=False, message="Invalid email address.", payload={"lead": lead})
+            return EmailResult(success=False, message="Invalid email address.", lead_index=lead.index)
 
         if "bounce" in email.lower():
-            return EmailResult(success=False, message="Simulated email bounce.", payload={"lead": lead})
-
-        subject = "Welcome to our service"
-        body = f"Hi {name},\n\nThank you for your interest. We will be in touch shortly.\n"
+            return EmailResult(success=False, message="Simulated email bounce.", lead_index=lead.index)
 
-        self._logger.info("Sending welcome email", extra={"email": email, "subject": subject, "body": body})
+        # The logged message stands in for the real send; skip rendering
+        # when it would be dropped
+        if self._logger.isEnabledFor(self.log_level):
+            subject, body = self.templates.render(lead)
+            extra = {"email": email, "subject": subject, "body": body}
+            self._logger.log(self.log_level, "Sending welcome email", extra=extra)
 
-        return EmailResult(success=True, message="Welcome email logged as sent.", payload={"lead": lead})
+        return EmailResult(success=True, message="Welcome email logged as sent.", lead_index=lead.index)
 
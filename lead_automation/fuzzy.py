@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Callable, List, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .normalise import canonical_email_keys
+
+logger = logging.getLogger(__name__)
+
+FUZZY_MODES = ("report", "drop")
+
+# Weight of each field in a pair's score. Fields missing on either side
+# are left out and the rest reweighted.
+NAME_WEIGHT = 0.5
+PHONE_WEIGHT = 0.3
+EMAIL_WEIGHT = 0.2
+
+# Trailing digits a phone is blocked and compared on, so "+1 555 123 4567"
+# and "(555) 123-4567" agree without knowing the country.
+_PHONE_DIGITS = 10
+_MIN_PHONE_DIGITS = 7
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+@lru_cache(maxsize=65536)
+def soundex(word: str) -> str:
+    """
+    American Soundex code of ``word`` ("Robert" -> "R163"); "" for words
+    without letters.
+    """
+    letters = [ch for ch in word.lower() if "a" <= ch <= "z"]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for ch in letters[1:]:
+        digit = _SOUNDEX_CODES.get(ch, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # "h" and "w" do not separate letters with the same code
+        if ch not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def _similarity_function() -> Callable[[str, str], float]:
+    if find_spec("rapidfuzz") is not None:
+        from rapidfuzz.fuzz import ratio
+
+        return lambda a, b: ratio(a, b) / 100.0
+    return lambda a, b: SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+def _fold_names(names: pd.Series) -> pd.Series:
+    text = names.astype("string").str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+    return text.str.lower().str.replace(r"[^a-z]+", " ", regex=True).str.strip().replace("", pd.NA)
+
+
+def _name_blocks(names: pd.Series) -> pd.Series:
+    """
+    Soundex of the last name plus the first initial ("john smith" ->
+    "S530j"), so spelling variants of a surname share a block.
+    """
+    tokens = names.str.split()
+    last = tokens.str[-1]
+    codes = last.map(soundex, na_action="ignore")
+    return (codes + names.str[0]).where(codes.ne("").fillna(False))
+
+
+def _phone_digits(phones: pd.Series) -> pd.Series:
+    text = phones.astype("string").str.replace(r"\.0$", "", regex=True)
+    digits = text.str.replace(r"\D", "", regex=True).str[-_PHONE_DIGITS:]
+    return digits.where(digits.str.len().ge(_MIN_PHONE_DIGITS).fillna(False))
+
+
+def _block_pairs(keys: pd.Series, max_block_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    All pairs of row positions sharing a key, skipping missing keys and
+    blocks larger than ``max_block_size``.
+
+    Rows are sorted by key, and for each distance d the rows d apart that
+    still share a key are paired, so the work is linear in the number of
+    rows times the largest block kept.
+    """
+    codes, _ = pd.factorize(keys, use_na_sentinel=True)
+    sizes = np.bincount(codes[codes >= 0]) if (codes >= 0).any() else np.zeros(0, dtype=np.int64)
+    keep = codes >= 0
+    keep[keep] = (sizes[codes[keep]] > 1) & (sizes[codes[keep]] <= max_block_size)
+    positions = np.flatnonzero(keep)
+    codes = codes[keep]
+    order = np.argsort(codes, kind="stable")
+    positions, codes = positions[order], codes[order]
+
+    left: List[np.ndarray] = []
+    right: List[np.ndarray] = []
+    for distance in range(1, max_block_size):
+        same = codes[distance:] == codes[:-distance]
+        if not same.any():
+            break
+        left.append(positions[:-distance][same])
+        right.append(positions[distance:][same])
+    if not left:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(left), np.concatenate(right)
+
+
+def _components(n: int, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """
+    For each row, the position of the first row in its connected
+    component (min-label propagation with pointer jumping).
+    """
+    labels = np.arange(n)
+    while len(left):
+        low = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, low)
+        np.minimum.at(updated, right, low)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+    return labels
+
+
+@dataclass(frozen=True)
+class FuzzyDedup:
+    """
+    Finds leads that are probably the same person under different emails:
+    a near-identical name, the same phone, a similar address.
+
+    Candidate pairs come from blocking instead of comparing every pair:
+    rows are paired only when they share a phone (last 10 digits), a name
+    key (Soundex of the last name plus first initial) or an email domain.
+    Blocks larger than ``max_block_size`` (e.g. everyone at gmail.com) are
+    skipped, so the number of pairs grows linearly with the rows. Each
+    pair is scored as a weighted mean of name similarity, phone equality
+    and similarity of the email local parts, over the fields both rows
+    have; pairs need a name or phone on both sides and a score of at least
+    ``threshold``. Matches are joined transitively into clusters.
+
+    ``mode="report"`` only counts clusters; ``"drop"`` also keeps just the
+    first lead of each cluster. String similarity uses ``rapidfuzz`` when
+    installed, otherwise ``difflib``.
+    """
+
+    mode: str = "report"
+    threshold: float = 0.85
+    max_block_size: int = 50
+
+    def __post_init__(self) -> None:
+        if self.mode not in FUZZY_MODES:
+            raise ValueError(f"Unknown fuzzy dedup mode {self.mode!r}; expected one of {', '.join(FUZZY_MODES)}.")
+        if not 0 < self.threshold <= 1:
+            raise ValueError("threshold must be in (0, 1].")
+        if self.max_block_size < 2:
+            raise ValueError("max_block_size must be at least 2.")
+
+    def candidate_pairs(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, pd.DataFrame]:
+        """
+        Distinct candidate pairs (row positions, left < right) and the
+        per-row fields they are scored on.
+        """
+        n = len(df)
+        empty = pd.Series(pd.NA, index=df.index, dtype="string")
+        names = _fold_names(df["Name"]) if "Name" in df.columns else empty
+        phones = _phone_digits(df["Phone"]) if "Phone" in df.columns else empty
+        emails = canonical_email_keys(df["Email"])
+        local = emails.str.replace(r"@[^@]*$", "", regex=True)
+        domain = emails.str.extract(r"@([^@]*)$", expand=False)
+        fields = pd.DataFrame({"name": names, "phone": phones, "local": local}).reset_index(drop=True)
+
+        left_parts, right_parts = [], []
+        for keys in (phones, _name_blocks(names), domain):
+            left, right = _block_pairs(keys.reset_index(drop=True), self.max_block_size)
+            left_parts.append(np.minimum(left, right))
+            right_parts.append(np.maximum(left, right))
+        pairs = np.unique(np.concatenate(left_parts) * n + np.concatenate(right_parts))
+        return pairs // max(n, 1), pairs % max(n, 1), fields
+
+    def matches(self, fields: pd.DataFrame, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """
+        Which candidate pairs score at least ``threshold``.
+
+        Phone equality is compared for all pairs at once; string
+        similarity is only computed for pairs that could still reach the
+        threshold if the remaining fields matched perfectly, which rules
+        out most pairs (e.g. two known, different phones cap the score at
+        0.7) before any per-pair work.
+        """
+        similarity = _similarity_function()
+
+        def known(column: str) -> np.ndarray:
+            present = fields[column].notna().to_numpy()
+            return present[left] & present[right]
+
+        def pair_similarity(column: str, todo: np.ndarray) -> np.ndarray:
+            values = fields[column].fillna("").to_numpy(dtype=object)
+            result = np.zeros(len(left))
+            rows = np.flatnonzero(todo)
+            result[rows] = [
+                1.0 if a == b else similarity(a, b) for a, b in zip(values[left[rows]], values[right[rows]])
+            ]
+            return result
+
+        name_known, phone_known, local_known = known("name"), known("phone"), known("local")
+        phones = fields["phone"].fillna("").to_numpy(dtype=object)
+        phone = (phones[left] == phones[right]) & phone_known
+        weights = NAME_WEIGHT * name_known + PHONE_WEIGHT * phone_known + EMAIL_WEIGHT * local_known
+        weights = np.where(name_known | phone_known, weights, np.inf)
+        needed = self.threshold * weights
+
+        todo = PHONE_WEIGHT * phone + NAME_WEIGHT * name_known + EMAIL_WEIGHT * local_known >= needed
+        name = pair_similarity("name", todo & name_known)
+        todo &= PHONE_WEIGHT * phone + NAME_WEIGHT * name + EMAIL_WEIGHT * local_known >= needed
+        local = pair_similarity("local", todo & local_known)
+        return todo & (PHONE_WEIGHT * phone + NAME_WEIGHT * name + EMAIL_WEIGHT * local >= needed)
+
+    def clusters(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        For each row of ``df``, the position of the first row of its
+        cluster (its own position if it matched nothing).
+        """
+        left, right, fields = self.candidate_pairs(df)
+        if len(left):
+            matched = self.matches(fields, left, right)
+            left, right = left[matched], right[matched]
+        return _components(len(df), left, right)
+
+    def apply(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, int, int]:
+        """
+        Find the clusters in ``df``; returns the leads to keep (all of
+        them in report mode), the number of clusters and the number of
+        leads beyond the first in each.
+        """
+        if not len(df) or "Email" not in df.columns:
+            return df, 0, 0
+        labels = self.clusters(df)
+        duplicate = labels != np.arange(len(df))
+        cluster_count = len(np.unique(labels[duplicate]))
+        duplicates = int(duplicate.sum())
+        logger.info(
+            "Fuzzy dedup found %d clusters (%d likely duplicate leads)",
+            cluster_count,
+            duplicates,
+            extra={"fuzzy_clusters": cluster_count, "fuzzy_duplicates": duplicates, "mode": self.mode},
+        )
+        if self.mode == "drop" and duplicates:
+            df = df[~duplicate]
+        return df, cluster_count, duplicates
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Set, Tuple
+import os
+
+import numpy as np
+import pandas as pd
+
+from .columns import CANONICAL_COLUMNS
+from .dedup import hash_emails
+from .ledger import ledger_key
+
+INCREMENTAL_MODES = ("fingerprint", "created-date")
+
+
+def _email_keys(emails: pd.Series) -> np.ndarray:
+    # Same normalisation as ``ledger_key``, vectorised
+    return hash_emails(emails.astype("string").str.strip().str.lower().fillna(""))
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    # Hash the text form of the lead columns, so a value read back as a
+    # different dtype (e.g. a date as text) does not count as a change.
+    columns = [col for col in CANONICAL_COLUMNS if col in df.columns]
+    return pd.util.hash_pandas_object(df[columns].astype("string"), index=False).to_numpy(dtype=np.uint64)
+
+
+def _created_dates(df: pd.DataFrame) -> pd.Series:
+    if "Created Date" not in df.columns:
+        return pd.Series(pd.NaT, index=df.index)
+    # Exports mix "2024-01-01" and "2024-01-01 09:30:00"; parse each value
+    return pd.to_datetime(df["Created Date"], errors="coerce", format="mixed")
+
+
+class IncrementalState:
+    """
+    What earlier runs already processed, so a cumulative daily export only
+    dispatches its new rows.
+
+    In ``fingerprint`` mode (default) a row is selected when its email has
+    not been processed before or any of its lead columns changed since; the
+    state is a sorted array of email hashes with the matching row hashes.
+    ``created-date`` mode instead selects rows whose Created Date is later
+    than the watermark, or on it but with an email not processed yet
+    (exports often carry only the day, so later leads of the watermark's
+    day tie with it); rows without a date are always selected. It needs
+    no row hashing but misses edits to old rows. The watermark and the
+    email hashes are tracked in both modes.
+
+    ``select`` remembers the rows it returns; ``commit`` adds them to the
+    state and saves it, leaving out leads passed to ``discard`` (transient
+    CRM failures), so those are retried on the next run; the watermark
+    also stops short of the oldest of them.
+    """
+
+    def __init__(self, path: Path, mode: str = "fingerprint") -> None:
+        if mode not in INCREMENTAL_MODES:
+            raise ValueError(f"Unknown incremental mode {mode!r}; expected one of {', '.join(INCREMENTAL_MODES)}.")
+        self.path = path
+        self.mode = mode
+        self._emails = np.empty(0, dtype=np.uint64)
+        self._rows = np.empty(0, dtype=np.uint64)
+        self.watermark: pd.Timestamp | None = None
+        if path.exists():
+            with np.load(path, allow_pickle=False) as data:
+                self._emails = data["emails"]
+                self._rows = data["rows"]
+                watermark = str(data["watermark"])
+                self.watermark = pd.Timestamp(watermark) if watermark else None
+
+        self._pending_emails: list[np.ndarray] = []
+        self._pending_rows: list[np.ndarray] = []
+        self._pending_dates: list[pd.Series] = []
+        self._failed: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._emails)
+
+    def select(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+        """
+        Return the new or changed rows of a cleaned frame, and how many
+        rows were skipped as already processed.
+        """
+        emails = _email_keys(df["Email"])
+        rows = _row_hashes(df)
+        dates = _created_dates(df)
+
+        if self.mode == "created-date":
+            if self.watermark is None:
+                selected = np.ones(len(df), dtype=bool)
+            else:
+                newer = (dates.isna() | (dates > self.watermark)).to_numpy(dtype=bool)
+                tied = (dates == self.watermark).fillna(False).to_numpy(dtype=bool)
+                known, _ = self._lookup(emails)
+                selected = newer | (tied & ~known)
+        elif len(self._emails) == 0:
+            selected = np.ones(len(df), dtype=bool)
+        else:
+            known, positions = self._lookup(emails)
+            selected = ~(known & (self._rows[positions] == rows))
+
+        self._pending_emails.append(emails[selected])
+        self._pending_rows.append(rows[selected])
+        self._pending_dates.append(dates[selected])
+        return df[selected], int(len(df) - selected.sum())
+
+    def _lookup(self, emails: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Whether each email hash is in the state, and where
+        if len(self._emails) == 0:
+            return np.zeros(len(emails), dtype=bool), np.zeros(len(emails), dtype=np.intp)
+        positions = np.minimum(np.searchsorted(self._emails, emails), len(self._emails) - 1)
+        return self._emails[positions] == emails, positions
+
+    @property
+    def discarded(self) -> Set[str]:
+        """
+        Keys of the leads passed to ``discard`` since the last commit, for
+        checkpoints; a resumed run passes them to ``discard`` again.
+        """
+        return self._failed
+
+    def discard(self, email: Any) -> None:
+        """
+        Keep a selected lead out of the state, e.g. because its CRM insert
+        failed transiently.
+        """
+        self._failed.add(ledger_key(email))
+
+    def commit(self) -> None:
+        """
+        Add the selected (and not discarded) rows to the state, advance the
+        watermark and save atomically.
+        """
+        emails = np.concatenate(self._pending_emails) if self._pending_emails else np.empty(0, dtype=np.uint64)
+        rows = np.concatenate(self._pending_rows) if self._pending_rows else np.empty(0, dtype=np.uint64)
+        dates = pd.Series([], dtype="datetime64[ns]")
+        if self._pending_dates:
+            dates = pd.concat(self._pending_dates, ignore_index=True)
+
+        keep = np.ones(len(emails), dtype=bool)
+        if self._failed:
+            keep = ~np.isin(emails, _email_keys(pd.Series(sorted(self._failed))))
+
+        # The watermark must not pass a lead that still has to be retried
+        done_dates = dates[keep]
+        failed_dates = dates[~keep].dropna()
+        if len(failed_dates):
+            done_dates = done_dates[done_dates < failed_dates.min()]
+        newest = done_dates.max() if len(done_dates) else pd.NaT
+        if pd.notna(newest) and (self.watermark is None or newest > self.watermark):
+            self.watermark = newest
+
+        # Newer fingerprints replace older ones for the same email
+        all_emails = np.concatenate([self._emails, emails[keep]])
+        all_rows = np.concatenate([self._rows, rows[keep]])
+        self._emails, last = np.unique(all_emails[::-1], return_index=True)
+        self._rows = all_rows[::-1][last]
+
+        self._pending_emails, self._pending_rows, self._pending_dates = [], [], []
+        self._failed = set()
+        self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            np.savez(
+                f,
+                emails=self._emails,
+                rows=self._rows,
+                watermark=np.array(self.watermark.isoformat() if self.watermark is not None else ""),
+            )
+        os.replace(tmp_path, self.path)
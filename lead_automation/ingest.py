@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, Iterator, List, Sequence
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from .columns import ColumnAliases, column_renames
+
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+EXCEL_ENGINES = ("openpyxl", "calamine")
+
+
+def default_excel_engine() -> str:
+    """
+    The fastest installed Excel engine: ``calamine`` (Rust, via the optional
+    ``python-calamine`` package) when available, otherwise openpyxl.
+    """
+    return "calamine" if find_spec("python_calamine") is not None else "openpyxl"
+
+
+def _header_names(header: Sequence[Any]) -> List[Any]:
+    # Match pandas' naming for blank header cells.
+    return [f"Unnamed: {i}" if value is None else value for i, value in enumerate(header)]
+
+
+def _input_kind(input_path: Path) -> str:
+    suffix = input_path.suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in {".parquet", ".pq"}:
+        return "parquet"
+    if suffix in {".feather", ".arrow"}:
+        return "feather"
+    return "excel"
+
+
+def list_sheets(input_path: Path) -> List[str | None]:
+    """
+    Sheet names of an Excel workbook, in workbook order; ``[None]`` for
+    the other (single-table) formats.
+    """
+    if _input_kind(input_path) != "excel":
+        return [None]
+    workbook = load_workbook(input_path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def _worksheet(workbook: Any, sheet: str | None) -> Any:
+    return workbook.worksheets[0] if sheet is None else workbook[sheet]
+
+
+def read_header(input_path: Path, sheet: str | None = None) -> List[Any]:
+    """
+    Read only the header row of a leads file, without parsing any data.
+    Excel reads use ``sheet`` (default: the first sheet).
+    """
+    kind = _input_kind(input_path)
+    if kind == "csv":
+        return list(pd.read_csv(input_path, nrows=0).columns)
+    if kind == "parquet":
+        import pyarrow.parquet as pq
+
+        return list(pq.read_schema(input_path).names)
+    if kind == "feather":
+        import pyarrow.ipc
+
+        with pyarrow.ipc.open_file(input_path) as reader:
+            return list(reader.schema.names)
+
+    workbook = load_workbook(input_path, read_only=True, data_only=True)
+    try:
+        rows = _worksheet(workbook, sheet).iter_rows(max_row=1, values_only=True)
+        return _header_names(next(rows, ()))
+    finally:
+        workbook.close()
+
+
+def known_columns(header: Sequence[Any], aliases: ColumnAliases | None = None) -> List[Any]:
+    """
+    Header names that resolve to one of the pipeline's canonical columns,
+    in file order.
+    """
+    renames = column_renames(header, aliases)
+    return [col for col in header if col in renames]
+
+
+def _iter_excel_chunks(
+    input_path: Path,
+    chunk_size: int,
+    usecols: Sequence[Any] | None = None,
+    sheet: str | None = None,
+) -> Iterator[pd.DataFrame]:
+    workbook = load_workbook(input_path, read_only=True, data_only=True)
+    try:
+        rows = _worksheet(workbook, sheet).iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = _header_names(header)
+
+        width = len(columns)
+        positions: List[int] | None = None
+        if usecols is not None:
+            positions = [i for i, col in enumerate(columns) if col in usecols]
+            columns = [columns[i] for i in positions]
+
+        buffer: List[Sequence[Any]] = []
+        # Blank rows are only kept when data follows them; pandas drops
+        # trailing blank rows, and read-only sheets often report some.
+        blank_run = 0
+        for row in rows:
+            if all(value is None for value in row):
+                blank_run += 1
+                continue
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            if blank_run:
+                buffer.extend([[None] * len(columns)] * blank_run)
+                blank_run = 0
+            buffer.append(row[:width] if positions is None else [row[i] for i in positions])
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame(buffer, columns=columns)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=columns)
+    finally:
+        workbook.close()
+
+
+def _iter_parquet_chunks(
+    input_path: Path,
+    chunk_size: int,
+    usecols: Sequence[Any] | None = None,
+) -> Iterator[pd.DataFrame]:
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(input_path)
+    columns = list(usecols) if usecols is not None else None
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+        yield batch.to_pandas()
+
+
+def _iter_feather_chunks(
+    input_path: Path,
+    chunk_size: int,
+    usecols: Sequence[Any] | None = None,
+) -> Iterator[pd.DataFrame]:
+    # Memory-mapped, so only the batch being converted is read (and, for
+    # compressed files, decompressed) at a time
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    with pa.memory_map(str(input_path)) as source:
+        reader = pyarrow.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if usecols is not None:
+                batch = batch.select(list(usecols))
+            for start in range(0, batch.num_rows, chunk_size):
+                yield batch.slice(start, chunk_size).to_pandas()
+
+
+def _read_excel_projected(
+    input_path: Path,
+    usecols: Sequence[Any],
+    engine: str,
+    sheet: str | None = None,
+) -> pd.DataFrame:
+    # Values are read as plain objects; cleanup's trim step runs the same
+    # type inference on them that a full read would have done.
+    if engine == "calamine":
+        sheet_name = 0 if sheet is None else sheet
+        return pd.read_excel(input_path, engine="calamine", sheet_name=sheet_name, usecols=list(usecols), dtype=object)
+    chunks = list(_iter_excel_chunks(input_path, chunk_size=1_000_000, usecols=usecols, sheet=sheet))
+    if not chunks:
+        return pd.DataFrame(columns=list(usecols))
+    return pd.concat(chunks, ignore_index=True).astype(object)
+
+
+def read_leads(
+    input_path: Path,
+    project: bool = False,
+    engine: str | None = None,
+    sheet: str | None = None,
+    aliases: ColumnAliases | None = None,
+) -> pd.DataFrame:
+    """
+    Load a whole leads file. Excel is the default (``sheet``, or the first
+    sheet); ``.csv``, ``.parquet`` and ``.feather`` files (e.g. a previous
+    run's cleaned output) are read with their native pandas readers.
+
+    With ``project=True`` the header row is sniffed first and only the
+    columns that resolve to Name/Email/Phone/Source/Created Date are
+    loaded, as resolved by ``aliases``. Projected Excel reads use
+    ``engine`` (default: see ``default_excel_engine``).
+    """
+    kind = _input_kind(input_path)
+    usecols = known_columns(read_header(input_path, sheet), aliases) if project else None
+
+    if kind == "csv":
+        return pd.read_csv(input_path, usecols=usecols)
+    if kind == "parquet":
+        return pd.read_parquet(input_path, columns=usecols)
+    if kind == "feather":
+        return pd.read_feather(input_path, columns=usecols)
+    if usecols is None:
+        return pd.read_excel(input_path, sheet_name=0 if sheet is None else sheet)
+
+    engine = engine or default_excel_engine()
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f"Unknown Excel engine {engine!r}; expected one of {', '.join(EXCEL_ENGINES)}.")
+    return _read_excel_projected(input_path, usecols, engine, sheet)
+
+
+def iter_raw_chunks(
+    input_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    project: bool = False,
+    aliases: ColumnAliases | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a leads file as a sequence of DataFrames of at most ``chunk_size`` rows.
+
+    ``.csv`` files go through pandas' chunked CSV reader and Parquet files
+    are read batch by batch; Excel workbooks are iterated row by row with
+    openpyxl in read-only mode (first sheet), so only one chunk is held in
+    memory at a time. Feather files are memory-mapped and read record
+    batch by record batch.
+    ``project`` limits every chunk to the known columns, as in
+    ``read_leads``.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    if not input_path.exists():
+        raise FileNotFoundError(input_path)
+
+    kind = _input_kind(input_path)
+    usecols = known_columns(read_header(input_path), aliases) if project else None
+
+    if kind == "csv":
+        with pd.read_csv(input_path, chunksize=chunk_size, usecols=usecols) as reader:
+            yield from reader
+    elif kind == "parquet":
+        yield from _iter_parquet_chunks(input_path, chunk_size, usecols)
+    elif kind == "feather":
+        yield from _iter_feather_chunks(input_path, chunk_size, usecols)
+    else:
+        yield from _iter_excel_chunks(input_path, chunk_size, usecols)
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+
+from .metrics import MetricsRegistry, RunProgress
+from .pipeline import run_pipeline
+
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class QueueFull(RuntimeError):
+    """
+    Raised by ``JobQueue.submit`` when no more jobs can be accepted.
+    """
+
+
+@dataclass
+class Job:
+    id: str
+    status: str
+    input_path: str
+    cleaned_path: str | None
+    report_path: str
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: str | None = None
+    # ``PipelineStats.to_dict()`` of a succeeded job.
+    result: Dict[str, Any] | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """
+    Runs pipeline jobs on a bounded thread pool and records them in a
+    SQLite job table.
+
+    At most ``max_concurrent`` jobs run at once and up to ``max_queued``
+    more wait for a free slot; beyond that ``submit`` raises ``QueueFull``
+    straight away instead of letting work pile up. Threads (not
+    processes) are used because a run is mostly client I/O and the live
+    progress of a running job is read from its in-memory stats.
+
+    Jobs that were queued or running when a previous process stopped are
+    marked failed on startup; their temp inputs may be gone, so they are
+    not restarted.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_concurrent: int = 2,
+        max_queued: int = 8,
+        metrics: MetricsRegistry | None = None,
+        pipeline_options: Dict[str, Any] | None = None,
+    ) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1.")
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.max_concurrent = max_concurrent
+        self.max_queued = max(0, max_queued)
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self.pipeline_options = dict(pipeline_options or {})
+        self._lock = threading.Lock()
+        self._active: Set[str] = set()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="pipeline-job")
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                input_path TEXT NOT NULL,
+                cleaned_path TEXT,
+                report_path TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                error TEXT,
+                result TEXT
+            )
+            """
+        )
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE status IN (?, ?)",
+            (FAILED, "Server stopped before the job finished.", time.time(), QUEUED, RUNNING),
+        )
+        self._conn.commit()
+
+    @property
+    def active(self) -> int:
+        """
+        Jobs queued or running in this process.
+        """
+        with self._lock:
+            return len(self._active)
+
+    def active_ids(self) -> Set[str]:
+        with self._lock:
+            return set(self._active)
+
+    def submit(
+        self,
+        input_path: Path,
+        cleaned_path: Path | None,
+        report_path: Path,
+        job_id: str | None = None,
+    ) -> str:
+        """
+        Queue a pipeline run and return its job id without waiting for it.
+        """
+        job_id = job_id or uuid.uuid4().hex[:12]
+        with self._lock:
+            if len(self._active) >= self.max_concurrent + self.max_queued:
+                raise QueueFull(f"{len(self._active)} jobs already queued or running.")
+            self._active.add(job_id)
+
+        job = Job(
+            id=job_id,
+            status=QUEUED,
+            input_path=str(input_path),
+            cleaned_path=str(cleaned_path) if cleaned_path is not None else None,
+            report_path=str(report_path),
+            created_at=time.time(),
+        )
+        try:
+            self._execute(
+                "INSERT INTO jobs (id, status, input_path, cleaned_path, report_path, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job.id, job.status, job.input_path, job.cleaned_path, job.report_path, job.created_at),
+            )
+            self._executor.submit(self._run, job)
+        except BaseException:
+            with self._lock:
+                self._active.discard(job_id)
+            raise
+        return job.id
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, input_path, cleaned_path, report_path, created_at, started_at, finished_at,"
+                " error, result FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        *fields, result = row
+        return Job(*fields, result=json.loads(result) if result else None)
+
+    def progress(self, job_id: str) -> RunProgress | None:
+        """
+        Live progress of a job that has started in this process.
+        """
+        return self.metrics.get(job_id)
+
+    def close(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def _run(self, job: Job) -> None:
+        progress = self.metrics.start_run(job.id)
+        self._execute("UPDATE jobs SET status = ?, started_at = ? WHERE id = ?", (RUNNING, time.time(), job.id))
+        error: Optional[str] = None
+        result = None
+        try:
+            stats = run_pipeline(
+                input_excel=Path(job.input_path),
+                cleaned_excel=Path(job.cleaned_path) if job.cleaned_path else None,
+                report_path=Path(job.report_path),
+                progress=progress.update,
+                **self.pipeline_options,
+            )
+            result = json.dumps(stats.to_dict())
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Pipeline job failed", extra={"job_id": job.id})
+            error = str(exc) or type(exc).__name__
+        finally:
+            self.metrics.finish_run(progress, error=error)
+            self._execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ?, result = ? WHERE id = ?",
+                (FAILED if error is not None else SUCCEEDED, time.time(), error, result, job.id),
+            )
+            with self._lock:
+                self._active.discard(job.id)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator
+
+import pandas as pd
+
+from .columns import CANONICAL_COLUMNS
+
+_ATTRIBUTES: Dict[str, str] = {
+    "Name": "name",
+    "Email": "email",
+    "Phone": "phone",
+    "Source": "source",
+    "Created Date": "created_date",
+}
+
+
+class Lead(Mapping):
+    """
+    One cleaned lead, as handed to the CRM and email clients.
+
+    Only the canonical columns are kept, in slots instead of a per-lead
+    dict, together with the lead's 1-based position in the run
+    (``index``), which results refer to instead of carrying the lead. It
+    reads like a mapping keyed by the canonical column names
+    (``lead["Email"]``, ``lead.get("Name")``), so client code written
+    against dict records keeps working; columns missing from the input
+    are None.
+    """
+
+    __slots__ = ("index", "name", "email", "phone", "source", "created_date")
+
+    def __init__(
+        self,
+        index: int,
+        name: Any = None,
+        email: Any = None,
+        phone: Any = None,
+        source: Any = None,
+        created_date: Any = None,
+    ) -> None:
+        self.index = index
+        self.name = name
+        self.email = email
+        self.phone = phone
+        self.source = source
+        self.created_date = created_date
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, _ATTRIBUTES[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        attribute = _ATTRIBUTES.get(key)
+        return default if attribute is None else getattr(self, attribute)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(CANONICAL_COLUMNS)
+
+    def __len__(self) -> int:
+        return len(CANONICAL_COLUMNS)
+
+    def __repr__(self) -> str:
+        return f"Lead(index={self.index}, email={self.email!r})"
+
+
+def iter_leads(frames: Iterable[pd.DataFrame], start: int = 1) -> Iterator[Lead]:
+    """
+    Lazily turn cleaned frames into ``Lead`` records numbered from
+    ``start``. Rows are read with ``itertuples``, so no per-row dict is
+    built and only the leads being dispatched are alive at a time.
+    Columns other than the canonical ones are not carried over.
+    """
+    index = start
+    for frame in frames:
+        missing = [col for col in CANONICAL_COLUMNS if col not in frame.columns]
+        if missing:
+            frame = frame.assign(**dict.fromkeys(missing))
+        for row in frame[list(CANONICAL_COLUMNS)].itertuples(index=False, name=None):
+            yield Lead(index, *row)
+            index += 1
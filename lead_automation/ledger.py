@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+import sqlite3
+import threading
+import time
+
+
+# SQLite's default limit on bound parameters is 999 on older builds.
+_LOOKUP_CHUNK = 500
+
+
+def ledger_key(email: Any) -> str:
+    """
+    Normalised email used as the ledger key.
+    """
+    return str(email or "").strip().lower()
+
+
+class LeadLedger:
+    """
+    On-disk record of which leads already reached the CRM and received
+    their welcome email, keyed by normalised email.
+
+    The pipeline checks it in bulk before dispatching, so a rerun after a
+    crash skips finished leads instead of re-sending them. Writes are
+    buffered and committed every ``flush_every`` updates (and on
+    ``close``); a crash can lose at most that many updates, whose leads
+    are then sent again on the next run.
+    """
+
+    def __init__(self, path: Path, flush_every: int = 100) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, int, int, float]] = []
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS leads (
+                email_key TEXT PRIMARY KEY,
+                crm_ok INTEGER NOT NULL DEFAULT 0,
+                email_ok INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def lookup(self, emails: Iterable[Any]) -> Dict[str, Tuple[bool, bool]]:
+        """
+        Return ``{key: (crm_ok, email_ok)}`` for the given emails that the
+        ledger knows about; unknown emails are absent.
+        """
+        keys = list({ledger_key(email) for email in emails})
+        found: Dict[str, Tuple[bool, bool]] = {}
+        with self._lock:
+            self._flush_locked()
+            for start in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[start : start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT email_key, crm_ok, email_ok FROM leads WHERE email_key IN ({placeholders})",
+                    chunk,
+                )
+                for key, crm_ok, email_ok in rows:
+                    found[key] = (bool(crm_ok), bool(email_ok))
+        return found
+
+    def record(self, email: Any, crm_ok: bool, email_ok: bool) -> None:
+        """
+        Record the outcome for one lead. Success flags only ever move from
+        false to true, so a later failed retry cannot undo an earlier
+        success.
+        """
+        with self._lock:
+            self._pending.append((ledger_key(email), int(crm_ok), int(email_ok), time.time()))
+            if len(self._pending) >= self.flush_every:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        self._conn.executemany(
+            """
+            INSERT INTO leads (email_key, crm_ok, email_ok, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(email_key) DO UPDATE SET
+                crm_ok = MAX(crm_ok, excluded.crm_ok),
+                email_ok = MAX(email_ok, excluded.email_ok),
+                updated_at = excluded.updated_at
+            """,
+            self._pending,
+        )
+        self._conn.commit()
+        self._pending = []
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+    def __enter__(self) -> "LeadLedger":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Tuple
+import os
+import time
+
+from .reporting import PipelineStats
+
+# Upper bounds (seconds) of the stage duration histogram buckets.
+STAGE_BUCKETS: Tuple[float, ...] = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+# name -> (help text, labels, value from stats)
+_COUNTERS: Tuple[Tuple[str, str, Dict[str, str], Any], ...] = (
+    ("lead_pipeline_raw_leads_total", "Rows read from input files.", {}, lambda s: s.cleanup.total_raw_leads),
+    (
+        "lead_pipeline_leads_dropped_total",
+        "Rows dropped during cleanup.",
+        {"reason": "missing_email"},
+        lambda s: s.cleanup.leads_skipped_missing_email,
+    ),
+    (
+        "lead_pipeline_leads_dropped_total",
+        "Rows dropped during cleanup.",
+        {"reason": "duplicate"},
+        lambda s: s.cleanup.duplicates_removed,
+    ),
+    (
+        "lead_pipeline_leads_processed_total",
+        "Cleaned leads dispatched to the CRM/email clients.",
+        {},
+        lambda s: s.timings.leads_dispatched,
+    ),
+    (
+        "lead_pipeline_leads_ledger_skipped_total",
+        "Leads skipped because the ledger already recorded them as done.",
+        {},
+        lambda s: s.ledger_skipped,
+    ),
+    (
+        "lead_pipeline_crm_requests_total",
+        "CRM inserts by result.",
+        {"result": "success"},
+        lambda s: s.successful_crm_updates,
+    ),
+    (
+        "lead_pipeline_crm_requests_total",
+        "CRM inserts by result.",
+        {"result": "failure"},
+        lambda s: s.failed_crm_updates,
+    ),
+    ("lead_pipeline_emails_total", "Welcome emails by result.", {"result": "sent"}, lambda s: s.emails_sent),
+    ("lead_pipeline_emails_total", "Welcome emails by result.", {"result": "failure"}, lambda s: s.email_failures),
+    ("lead_pipeline_retries_total", "Retried client calls.", {"client": "crm"}, lambda s: s.crm_retries),
+    ("lead_pipeline_retries_total", "Retried client calls.", {"client": "email"}, lambda s: s.email_retries),
+)
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    return "{" + inner + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class RunProgress:
+    """
+    Live view of one pipeline run.
+
+    Pass ``update`` as the pipeline's ``progress`` callback. It only keeps
+    a reference to the run's stats, which the pipeline keeps updating in
+    place; other threads read the counts when asked, so nothing is copied
+    on the dispatch hot loop. Counts read mid-run may be a batch apart
+    from each other, which is fine for a progress view.
+    """
+
+    def __init__(self, run_id: str) -> None:
+        self.run_id = run_id
+        self.state = "running"
+        self.error: str | None = None
+        self.started_at = time.time()
+        self.finished_at: float | None = None
+        self.stats: PipelineStats | None = None
+
+    def update(self, stats: PipelineStats) -> None:
+        self.stats = stats
+
+    def snapshot(self) -> Dict[str, Any]:
+        end = self.finished_at if self.finished_at is not None else time.time()
+        elapsed = end - self.started_at
+        snapshot: Dict[str, Any] = {
+            "run_id": self.run_id,
+            "state": self.state,
+            "error": self.error,
+            "elapsed_seconds": round(elapsed, 3),
+        }
+        stats = self.stats
+        if stats is None:
+            snapshot.update(processed=0, cleaned_leads=0, counts={})
+            return snapshot
+        cleanup = stats.cleanup
+        processed = stats.timings.leads_dispatched + stats.ledger_skipped
+        snapshot.update(
+            processed=processed,
+            cleaned_leads=cleanup.total_raw_leads - cleanup.leads_skipped_missing_email - cleanup.duplicates_removed,
+            counts=stats.to_dict(),
+        )
+        return snapshot
+
+
+class MetricsRegistry:
+    """
+    Process-wide pipeline metrics, rendered in the Prometheus text format.
+
+    Counters are the totals of finished runs plus the live counts of runs
+    in progress, so they keep rising while a long run is dispatching.
+    Stage durations are observed into histograms when a run finishes.
+    Finished runs stay available for progress lookups, up to
+    ``keep_finished`` of them.
+    """
+
+    def __init__(self, keep_finished: int = 100) -> None:
+        self.keep_finished = keep_finished
+        self._lock = Lock()
+        self._runs: "OrderedDict[str, RunProgress]" = OrderedDict()
+        self._totals: Dict[Tuple[str, str], float] = {}
+        self._runs_finished: Dict[str, int] = {"succeeded": 0, "failed": 0}
+        self._stages: Dict[str, List[float]] = {}
+        self._stage_sums: Dict[str, float] = {}
+        self._stage_counts: Dict[str, int] = {}
+        self._last_throughput = 0.0
+
+    def start_run(self, run_id: str) -> RunProgress:
+        progress = RunProgress(run_id)
+        with self._lock:
+            self._runs[run_id] = progress
+        return progress
+
+    def get(self, run_id: str) -> RunProgress | None:
+        with self._lock:
+            return self._runs.get(run_id)
+
+    def finish_run(self, progress: RunProgress, error: str | None = None) -> None:
+        with self._lock:
+            progress.finished_at = time.time()
+            progress.error = error
+            progress.state = "failed" if error is not None else "succeeded"
+            self._runs_finished[progress.state] += 1
+            stats = progress.stats
+            if stats is not None:
+                for key, value in self._counter_values(stats):
+                    self._totals[key] = self._totals.get(key, 0) + value
+                self._observe_stages(stats)
+                dispatch_seconds = stats.timings.stage_seconds.get("dispatch", 0.0)
+                if error is None and dispatch_seconds > 0:
+                    self._last_throughput = stats.timings.leads_dispatched / dispatch_seconds
+
+            finished = [run_id for run_id, run in self._runs.items() if run.state != "running"]
+            for run_id in finished[: max(0, len(finished) - self.keep_finished)]:
+                del self._runs[run_id]
+
+    @staticmethod
+    def _counter_values(stats: PipelineStats) -> List[Tuple[Tuple[str, str], float]]:
+        return [((name, _labels(labels)), value(stats)) for name, _, labels, value in _COUNTERS]
+
+    def _observe_stages(self, stats: PipelineStats) -> None:
+        stages = dict(stats.timings.stage_seconds)
+        stages.update({f"cleanup_{name}": seconds for name, seconds in stats.cleanup.stage_seconds.items()})
+        for stage, seconds in stages.items():
+            buckets = self._stages.setdefault(stage, [0] * len(STAGE_BUCKETS))
+            for i, bound in enumerate(STAGE_BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+            self._stage_sums[stage] = self._stage_sums.get(stage, 0.0) + seconds
+            self._stage_counts[stage] = self._stage_counts.get(stage, 0) + 1
+
+    def render(self) -> str:
+        with self._lock:
+            totals = dict(self._totals)
+            running = [run for run in self._runs.values() if run.state == "running"]
+            for run in running:
+                if run.stats is not None:
+                    for key, value in self._counter_values(run.stats):
+                        totals[key] = totals.get(key, 0) + value
+
+            lines: List[str] = []
+            described = set()
+            for name, help_text, labels, _ in _COUNTERS:
+                if name not in described:
+                    described.add(name)
+                    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                label_text = _labels(labels)
+                lines.append(f"{name}{label_text} {_number(totals.get((name, label_text), 0))}")
+
+            lines += [
+                "# HELP lead_pipeline_runs_total Finished pipeline runs by status.",
+                "# TYPE lead_pipeline_runs_total counter",
+            ]
+            for status, count in self._runs_finished.items():
+                lines.append(f'lead_pipeline_runs_total{{status="{status}"}} {count}')
+
+            lines += [
+                "# HELP lead_pipeline_runs_in_progress Pipeline runs currently running.",
+                "# TYPE lead_pipeline_runs_in_progress gauge",
+                f"lead_pipeline_runs_in_progress {len(running)}",
+                "# HELP lead_pipeline_last_run_throughput_leads_per_second Dispatch throughput of the last successful run.",
+                "# TYPE lead_pipeline_last_run_throughput_leads_per_second gauge",
+                f"lead_pipeline_last_run_throughput_leads_per_second {_number(round(self._last_throughput, 3))}",
+                "# HELP lead_pipeline_stage_duration_seconds Wall-clock duration of pipeline stages per run.",
+                "# TYPE lead_pipeline_stage_duration_seconds histogram",
+            ]
+            for stage, buckets in self._stages.items():
+                for bound, count in zip(STAGE_BUCKETS, buckets):
+                    lines.append(
+                        f'lead_pipeline_stage_duration_seconds_bucket{{stage="{stage}",le="{_number(bound)}"}} {count}'
+                    )
+                count = self._stage_counts[stage]
+                lines += [
+                    f'lead_pipeline_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {count}',
+                    f'lead_pipeline_stage_duration_seconds_sum{{stage="{stage}"}} {_number(self._stage_sums[stage])}',
+                    f'lead_pipeline_stage_duration_seconds_count{{stage="{stage}"}} {count}',
+                ]
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Path) -> None:
+        """
+        Write ``render()`` to ``path`` atomically, for node_exporter's
+        textfile collector.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp_path, path)
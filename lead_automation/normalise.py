@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Tuple
+
+import pandas as pd
+
+
+# Domains that deliver to the same mailbox as another domain.
+DOMAIN_ALIASES: Dict[str, str] = {"googlemail.com": "gmail.com"}
+
+# Providers that ignore a "+tag" suffix on the local part.
+PLUS_TAG_DOMAINS: FrozenSet[str] = frozenset(
+    {
+        "gmail.com", "outlook.com", "hotmail.com", "live.com", "msn.com",
+        "icloud.com", "me.com", "mac.com", "fastmail.com", "protonmail.com", "proton.me",
+    }
+)
+
+# Providers that ignore dots in the local part.
+DOT_INSENSITIVE_DOMAINS: FrozenSet[str] = frozenset({"gmail.com"})
+
+_PROVIDER_DOMAINS = frozenset(DOMAIN_ALIASES) | PLUS_TAG_DOMAINS | DOT_INSENSITIVE_DOMAINS
+
+# E.164 allows at most 15 digits. A national number needs at least 8 (with
+# its area code); fewer is usually a local number missing it.
+_MIN_NATIONAL_DIGITS = 8
+_MAX_PHONE_DIGITS = 15
+
+
+def _text(values: pd.Series) -> pd.Series:
+    return values.astype("string").str.strip()
+
+
+def canonical_email_keys(emails: pd.Series) -> pd.Series:
+    """
+    Key per email under which different spellings of one mailbox compare
+    equal: lowercased, googlemail.com folded into gmail.com, "+tag"
+    suffixes dropped and, for Gmail, dots in the local part removed.
+
+    ``Alice.Smith+news@GoogleMail.com`` and ``alicesmith@gmail.com`` get
+    the same key. Values without an "@" are only lowercased; missing
+    values stay missing.
+    """
+    text = _text(emails).str.lower()
+    domain = text.str.replace(r"^.*@", "", regex=True)
+    special = (domain.isin(_PROVIDER_DOMAINS) & text.str.contains("@", regex=False)).fillna(False).astype(bool)
+    if not special.any():
+        return text
+
+    # Only addresses at these providers change; rewrite just those rows.
+    domain = domain[special].replace(DOMAIN_ALIASES)
+    local = text[special].str.replace(r"@[^@]*$", "", regex=True)
+    local = local.where(~domain.isin(PLUS_TAG_DOMAINS), local.str.replace(r"\+.*$", "", regex=True))
+    local = local.where(~domain.isin(DOT_INSENSITIVE_DOMAINS), local.str.replace(".", "", regex=False))
+    keys = text.copy()
+    keys[special] = local + "@" + domain
+    return keys
+
+
+def phone_keys(phones: pd.Series, country_code: str = "1") -> pd.Series:
+    """
+    E.164-style phone numbers ("+15551234567"), missing where a value
+    cannot be read as a full number.
+
+    Numbers written with "+" or "00" are taken as international. Other
+    numbers are national: a leading trunk "0" is dropped and
+    ``country_code`` is put in front, unless the digits already start with
+    it and are longer than a national number (over 10 digits). Extensions
+    ("x123", "ext. 5") are ignored. Numbers read from a spreadsheet as
+    floats ("5551234567.0") are handled too.
+    """
+    text = _text(phones).str.replace(r"\.0$", "", regex=True)
+    text = text.str.replace(r"(?i)\s*(?:ext\.?|x|#)\s*\d+$", "", regex=True)
+    international = text.str.match(r"^(?:\+|00)").fillna(False).astype(bool)
+    digits = text.str.replace(r"\D", "", regex=True)
+
+    national = digits.str.replace(r"^0", "", regex=True)
+    long_enough = national.str.len().ge(_MIN_NATIONAL_DIGITS)
+    has_code = national.str.startswith(country_code) & national.str.len().gt(10)
+    national = national.where(has_code.fillna(False).astype(bool), country_code + national)
+    full = digits.str.replace(r"^00", "", regex=True).where(international, national)
+
+    length = full.str.len()
+    valid = (international | long_enough) & length.ge(_MIN_NATIONAL_DIGITS) & length.le(_MAX_PHONE_DIGITS)
+    valid = valid.fillna(False).astype(bool)
+    return ("+" + full).where(valid, pd.NA)
+
+
+@dataclass(frozen=True)
+class LeadNormaliser:
+    """
+    How cleanup compares and rewrites lead values.
+
+    With ``canonical_emails`` (the default) duplicates are found by
+    ``canonical_email_keys`` instead of the trimmed email text; the Email
+    column itself is left as the lead wrote it. With a
+    ``phone_country_code``, Phone values that parse are rewritten to
+    E.164 (``phone_keys``); others are kept as they are.
+    """
+
+    canonical_emails: bool = True
+    phone_country_code: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.phone_country_code is not None and not self.phone_country_code.isdigit():
+            raise ValueError("phone_country_code must be digits only, e.g. '1' or '44'.")
+
+    def email_keys(self, emails: pd.Series) -> pd.Series:
+        """
+        Dedup key per email.
+        """
+        return canonical_email_keys(emails) if self.canonical_emails else emails
+
+    def normalise_phones(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+        """
+        ``df`` with its Phone column in E.164 form where possible, and the
+        number of values that changed.
+        """
+        if self.phone_country_code is None or "Phone" not in df.columns or not len(df):
+            return df, 0
+        keys = phone_keys(df["Phone"], self.phone_country_code)
+        changed = keys.notna() & keys.ne(df["Phone"].astype("string")).fillna(True)
+        changed = changed.fillna(False).astype(bool)
+        if not changed.any():
+            return df, 0
+        df = df.copy()
+        df["Phone"] = df["Phone"].astype(object).mask(changed, keys.astype(object))
+        return df, int(changed.sum())
+
+
+DEFAULT_NORMALISER = LeadNormaliser()
+
+
+def collapsed_duplicates(emails: pd.Series, keys: pd.Series) -> int:
+    """
+    How many rows of ``emails`` are duplicates by ``keys`` but not by the
+    email text itself, i.e. what canonicalisation added to dedup.
+    """
+    return int(keys.duplicated().sum() - emails.duplicated().sum())
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Protocol
+
+import pandas as pd
+from openpyxl import Workbook
+
+from .columns import CANONICAL_COLUMNS
+
+CLEANED_FORMATS = ("xlsx", "csv", "parquet", "feather")
+
+_SUFFIX_FORMATS: Dict[str, str] = {
+    ".xlsx": "xlsx",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+}
+
+
+def resolve_format(path: Path, fmt: str | None = None) -> str:
+    """
+    Pick the cleaned-output format: an explicit ``fmt`` wins, otherwise it
+    comes from the file extension.
+    """
+    if fmt is not None:
+        fmt = fmt.lower()
+        if fmt not in CLEANED_FORMATS:
+            raise ValueError(f"Unsupported cleaned output format {fmt!r}; expected one of {', '.join(CLEANED_FORMATS)}.")
+        return fmt
+    try:
+        return _SUFFIX_FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Cannot infer cleaned output format from {path.name!r}; use one of "
+            f"{', '.join(sorted(_SUFFIX_FORMATS))} or pass a format explicitly."
+        ) from None
+
+
+def _require_pyarrow(fmt: str) -> Any:
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(f"{fmt} output requires pyarrow; install it or use xlsx/csv.") from None
+    return pyarrow
+
+
+def _arrow_compatible(df: pd.DataFrame) -> pd.DataFrame:
+    # Arrow columns have a single type. Spreadsheet columns such as Phone
+    # often mix numbers and text, so those are written as text.
+    mixed = [
+        col
+        for col in df.select_dtypes(include=["object", "string"]).columns
+        if pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed")
+    ]
+    if not mixed:
+        return df
+    df = df.copy()
+    for col in mixed:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def _as_text(df: pd.DataFrame, columns: List[Any]) -> pd.DataFrame:
+    df = df.copy()
+    for col in columns:
+        df[col] = df[col].astype(object).map(str, na_action="ignore")
+    return df
+
+
+def write_cleaned(df: pd.DataFrame, path: Path, fmt: str | None = None) -> None:
+    """
+    Write the cleaned leads in the requested format (see ``resolve_format``).
+    """
+    fmt = resolve_format(path, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "xlsx":
+        df.to_excel(path, index=False)
+    elif fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        _require_pyarrow(fmt)
+        _arrow_compatible(df).to_parquet(path, index=False)
+    else:
+        _require_pyarrow(fmt)
+        _arrow_compatible(df).reset_index(drop=True).to_feather(path)
+
+
+def read_cleaned(path: Path, fmt: str | None = None) -> pd.DataFrame:
+    """
+    Read back a cleaned output written by ``write_cleaned`` (or a chunk
+    writer) in format ``fmt``, which, as when writing, defaults to the one
+    the extension implies.
+    """
+    fmt = resolve_format(path, fmt)
+    if fmt == "xlsx":
+        return pd.read_excel(path)
+    if fmt == "csv":
+        return pd.read_csv(path)
+    _require_pyarrow(fmt)
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    return pd.read_feather(path)
+
+
+class ChunkWriter(Protocol):
+    def write(self, chunk: pd.DataFrame) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class _ExcelChunkWriter:
+    """
+    Append DataFrame chunks to a write-only openpyxl workbook, so the
+    cleaned output never has to exist in memory as one frame.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet()
+        self._header_written = False
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if not self._header_written:
+            self._sheet.append([str(col) for col in chunk.columns])
+            self._header_written = True
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            self._sheet.append(list(row))
+
+    def close(self) -> None:
+        self._workbook.save(self._path)
+
+
+class _CsvChunkWriter:
+    def __init__(self, path: Path) -> None:
+        self._file = path.open("w", encoding="utf-8", newline="")
+        self._header_written = False
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        chunk.to_csv(self._file, index=False, header=not self._header_written)
+        self._header_written = True
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ArrowChunkWriter:
+    """
+    Stream chunks into a Parquet file or an Arrow IPC (Feather v2) file.
+
+    The file schema is fixed when the first chunk arrives, but not simply
+    copied from it: a chunk can be all blank or all numeric in a column
+    that later holds text. The canonical lead columns (except Created Date)
+    are always text, other columns are text if the first chunk has no
+    values and float if it has only numbers. Later chunks are cast to the
+    schema, with values of text columns written as text.
+    """
+
+    def __init__(self, path: Path, fmt: str) -> None:
+        self._pa = _require_pyarrow(fmt)
+        self._path = path
+        self._fmt = fmt
+        self._schema = None
+        self._text_columns: List[Any] = []
+        self._writer: Any = None
+
+    def _build_schema(self, chunk: pd.DataFrame) -> Any:
+        pa = self._pa
+        fields = []
+        for col, field in zip(chunk.columns, pa.Schema.from_pandas(_arrow_compatible(chunk), preserve_index=False)):
+            if (col in CANONICAL_COLUMNS and col != "Created Date") or pa.types.is_null(field.type):
+                field = field.with_type(pa.string())
+                self._text_columns.append(col)
+            elif pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+                field = field.with_type(pa.float64())
+            fields.append(field)
+        return pa.schema(fields)
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        pa = self._pa
+        if self._schema is None:
+            self._schema = self._build_schema(chunk)
+        chunk = _as_text(_arrow_compatible(chunk), self._text_columns)
+        table = pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False)
+        if self._writer is None:
+            if self._fmt == "parquet":
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(self._path, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(str(self._path), self._schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_chunk_writer(path: Path, fmt: str | None = None) -> ChunkWriter:
+    """
+    Open an incremental writer for streamed cleanup; call ``write`` per
+    chunk and ``close`` once at the end.
+    """
+    fmt = resolve_format(path, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "xlsx":
+        return _ExcelChunkWriter(path)
+    if fmt == "csv":
+        return _CsvChunkWriter(path)
+    return _ArrowChunkWriter(path, fmt)
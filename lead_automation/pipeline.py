@@ -1,60 +1,1005 @@
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import count, islice
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import asyncio
+import heapq
 import logging
+import os
+import time
 
-from .cleanup import clean_leads, CleanupStats
+import pandas as pd
+
+from .checkpoint import Checkpointer
+from .cleanup import clean_leads, clean_many_leads, stream_clean_leads, CleanupStats
+from .clients import CRMClient, EmailClient
+from .columns import ColumnAliases
 from .crm import MockCRMClient, CRMResult
+from .dedup import EmailDedupIndex
 from .emailer import MockEmailClient, EmailResult
+from .fuzzy import FuzzyDedup
+from .incremental import IncrementalState
+from .leads import Lead, iter_leads
+from .ledger import LeadLedger, ledger_key
+from .normalise import DEFAULT_NORMALISER, LeadNormaliser
+from .outputs import read_cleaned, resolve_format
 from .reporting import PipelineStats, write_report
+from .retry import RetryPolicy, RetryingCRMClient, RetryingEmailClient
+from .throttle import ClientGuard, GuardedCRMClient, GuardedEmailClient
+from .timing import timed
 
 
 logger = logging.getLogger(__name__)
 
+# A CRM result of None means the CRM step was skipped because the ledger
+# already recorded it as done.
+LeadOutcome = Tuple[Optional[CRMResult], Optional[EmailResult]]
 
-def run_pipeline(
-    input_excel: Path,
-    cleaned_excel: Path,
-    report_path: Path,
-    crm_client: MockCRMClient | None = None,
-    email_client: MockEmailClient | None = None,
-) -> PipelineStats:
+# Called with the run's stats after cleanup and after every recorded batch.
+ProgressCallback = Callable[[PipelineStats], None]
+
+# A single leads file, or several whose sheets are cleaned in parallel.
+Inputs = Union[Path, Sequence[Path]]
+
+
+@dataclass
+class _PendingLead:
+    lead: Lead
+    skip_crm: bool = False
+    # Fully processed by an earlier run, according to the ledger.
+    done: bool = False
+
+
+Batch = List[_PendingLead]
+
+
+@dataclass
+class _BatchResult:
     """
-    Run the full lead processing pipeline:
-    - cleanup (Excel -> cleaned Excel)
-    - CRM insertion per lead
-    - welcome email after each successful CRM insert
-    - summary reporting
+    Outcomes of a batch, one per lead, plus the latency of each CRM and
+    email call made for it.
     """
-    crm_client = crm_client or MockCRMClient()
-    email_client = email_client or MockEmailClient(logger=logger)
 
-    cleaned_df, cleanup_stats = clean_leads(input_excel, cleaned_excel)
+    outcomes: List[LeadOutcome]
+    crm_seconds: List[float]
+    email_seconds: List[float]
+
+
+def _batched(leads: Iterable[Lead], batch_size: int) -> Iterator[Batch]:
+    """
+    Yield batches of leads; each keeps its 1-based ``Lead.index``, as used
+    in logs and checkpoints.
+    """
+    leads = iter(leads)
+    while True:
+        batch = [_PendingLead(lead) for lead in islice(leads, batch_size)]
+        if not batch:
+            return
+        yield batch
+
+
+def _skip_completed(batches: Iterable[Batch], ledger: LeadLedger) -> Iterator[Batch]:
+    """
+    Mark leads the ledger has fully processed as done, and those whose CRM
+    insert already succeeded so only their email is (re)tried. Each batch
+    is checked with a single bulk lookup.
+    """
+    for batch in batches:
+        status = ledger.lookup(item.lead.email for item in batch)
+        for item in batch:
+            crm_ok, email_ok = status.get(ledger_key(item.lead.email), (False, False))
+            item.done = crm_ok and email_ok
+            item.skip_crm = crm_ok
+        yield batch
+
+
+def _email_recipients(batch: Batch, crm_outcomes: List[Optional[CRMResult]]) -> List[Lead]:
+    """
+    Leads of a batch that get a welcome email: not done yet, and with a
+    successful (or earlier) CRM insert.
+    """
+    return [
+        item.lead
+        for item, crm_result in zip(batch, crm_outcomes)
+        if not item.done and (crm_result is None or crm_result.success)
+    ]
+
+
+def _pair_outcomes(
+    batch: Batch,
+    crm_outcomes: List[Optional[CRMResult]],
+    email_results: Iterator[EmailResult],
+    result: _BatchResult,
+) -> None:
+    for item, crm_result in zip(batch, crm_outcomes):
+        if item.done:
+            result.outcomes.append((None, None))
+            continue
+        email_result = next(email_results) if crm_result is None or crm_result.success else None
+        result.outcomes.append((crm_result, email_result))
+
+
+def _process_batch(
+    batch: Batch,
+    crm_client: CRMClient,
+    email_client: EmailClient,
+) -> _BatchResult:
+    """
+    CRM insert followed by the welcome email, for each lead of a batch.
+
+    Single-lead batches use ``send_lead``; larger ones go through the bulk
+    ``send_leads`` call, and likewise the welcome emails of the batch go
+    out through one ``send_welcome_emails`` call. The email is only
+    attempted after a successful CRM insert. This runs on worker threads
+    in concurrent mode, so it must not touch shared stats; the caller
+    records the outcomes and call latencies.
+    """
+    result = _BatchResult([], [], [])
+    leads = [item.lead for item in batch if not item.skip_crm]
+    start = time.perf_counter()
+    if len(leads) == 1:
+        crm_results = iter([crm_client.send_lead(leads[0])])
+    else:
+        crm_results = iter(crm_client.send_leads(leads) if leads else [])
+    if leads:
+        result.crm_seconds.append(time.perf_counter() - start)
+
+    crm_outcomes = [None if item.done or item.skip_crm else next(crm_results) for item in batch]
+    to_email = _email_recipients(batch, crm_outcomes)
+    start = time.perf_counter()
+    if len(to_email) == 1:
+        email_results = iter([email_client.send_welcome_email(to_email[0])])
+    else:
+        email_results = iter(email_client.send_welcome_emails(to_email) if to_email else [])
+    if to_email:
+        result.email_seconds.append(time.perf_counter() - start)
+
+    _pair_outcomes(batch, crm_outcomes, email_results, result)
+    return result
+
+
+async def _process_batch_async(
+    batch: Batch,
+    crm_client: CRMClient,
+    email_client: EmailClient,
+) -> _BatchResult:
+    result = _BatchResult([], [], [])
+    leads = [item.lead for item in batch if not item.skip_crm]
+    start = time.perf_counter()
+    if len(leads) == 1:
+        crm_results = iter([await crm_client.send_lead_async(leads[0])])
+    else:
+        crm_results = iter(await crm_client.send_leads_async(leads) if leads else [])
+    if leads:
+        result.crm_seconds.append(time.perf_counter() - start)
+
+    crm_outcomes = [None if item.done or item.skip_crm else next(crm_results) for item in batch]
+    to_email = _email_recipients(batch, crm_outcomes)
+    start = time.perf_counter()
+    if len(to_email) == 1:
+        email_results = iter([await email_client.send_welcome_email_async(to_email[0])])
+    else:
+        email_results = iter(await email_client.send_welcome_emails_async(to_email) if to_email else [])
+    if to_email:
+        result.email_seconds.append(time.perf_counter() - start)
+
+    _pair_outcomes(batch, crm_outcomes, email_results, result)
+    return result
+
 
-    stats = PipelineStats(cleanup=cleanup_stats)
+def lead_log_level(log_every: int) -> int:
+    """
+    Level of the per-lead log lines: INFO when every lead is logged,
+    DEBUG when ``log_every`` samples progress instead.
+    """
+    return logging.INFO if log_every <= 1 else logging.DEBUG
+
+
+class _OutcomeRecorder:
+    """
+    Bookkeeping for finished leads: stats, logging, the ledger and
+    checkpoints.
+
+    Only ever called from the dispatching thread (or event loop), in input
+    order, so none of this state needs locking, and after each batch the
+    stats cover exactly the leads up to ``cursor``.
+
+    With ``log_every`` above 1, the per-lead "Processing lead" lines drop
+    to DEBUG and a progress summary is logged at INFO every ``log_every``
+    leads instead, plus a final one from ``finish``; failures are always
+    logged individually.
+    """
+
+    def __init__(
+        self,
+        stats: PipelineStats,
+        ledger: LeadLedger | None = None,
+        checkpointer: Checkpointer | None = None,
+        cursor: int = 0,
+        progress: ProgressCallback | None = None,
+        incremental: IncrementalState | None = None,
+        log_every: int = 1,
+    ) -> None:
+        self.stats = stats
+        self.ledger = ledger
+        self.checkpointer = checkpointer
+        self.cursor = cursor
+        self.progress = progress
+        self.incremental = incremental
+        self.log_every = max(1, log_every)
+        self._lead_log_level = lead_log_level(log_every)
+
+    def log_batch(self, batch: Batch) -> None:
+        # Skip building per-lead records entirely when they would be dropped
+        if not logger.isEnabledFor(self._lead_log_level):
+            return
+        for item in batch:
+            if item.done:
+                continue
+            extra = {"index": item.lead.index, "email": item.lead.email}
+            logger.log(self._lead_log_level, "Processing lead", extra=extra)
+
+    def record_batch(self, batch: Batch, result: _BatchResult) -> None:
+        timings = self.stats.timings
+        for seconds in result.crm_seconds:
+            timings.crm.record(seconds)
+        for seconds in result.email_seconds:
+            timings.email.record(seconds)
+        for item, outcome in zip(batch, result.outcomes):
+            self._record(item, outcome)
+        self.cursor = batch[-1].lead.index
+        if self.checkpointer is not None:
+            discards = self.incremental.discarded if self.incremental is not None else ()
+            self.checkpointer.maybe_save(self.cursor, self.stats, discards)
+        if self.progress is not None:
+            self.progress(self.stats)
 
-    records = cleaned_df.to_dict(orient="records")
+    def _record(self, item: _PendingLead, outcome: LeadOutcome) -> None:
+        stats = self.stats
+        idx = item.lead.index
+        if item.done:
+            stats.ledger_skipped += 1
+            return
 
-    for idx, lead in enumerate(records, start=1):
-        logger.info("Processing lead", extra={"index": idx, "email": lead.get("Email")})
+        stats.timings.leads_dispatched += 1
+        crm_result, email_result = outcome
 
-        crm_result: CRMResult = crm_client.send_lead(lead)
-        if crm_result.success:
+        if crm_result is not None:
+            stats.crm_retries += crm_result.attempts - 1
+        if email_result is not None:
+            stats.email_retries += email_result.attempts - 1
+
+        if crm_result is None:
+            stats.ledger_email_only += 1
+        elif crm_result.success:
             stats.successful_crm_updates += 1
         else:
             stats.failed_crm_updates += 1
             logger.warning("CRM failed for lead", extra={"index": idx, "reason": crm_result.message})
+            # Permanent rejections would fail again, so only transient
+            # failures are left out of the incremental state for a retry
+            if self.incremental is not None and crm_result.retryable:
+                self.incremental.discard(item.lead.email)
+
+        if email_result is not None:
+            if email_result.success:
+                stats.emails_sent += 1
+            else:
+                stats.email_failures += 1
+                logger.warning("Email failed for lead", extra={"index": idx, "reason": email_result.message})
+
+        if self.ledger is not None:
+            self.ledger.record(
+                item.lead.email,
+                crm_ok=crm_result is None or crm_result.success,
+                email_ok=email_result is not None and email_result.success,
+            )
+
+        if self.log_every > 1 and stats.timings.leads_dispatched % self.log_every == 0:
+            self._log_progress()
+
+    def finish(self) -> None:
+        """
+        Log the final counts once dispatch is done, when progress is
+        summarised rather than logged per lead.
+        """
+        if self.log_every > 1:
+            self._log_progress("Dispatch finished: %d leads")
+
+    def _log_progress(self, message: str = "Dispatched %d leads") -> None:
+        stats = self.stats
+        counts = {
+            "leads_dispatched": stats.timings.leads_dispatched,
+            "successful_crm_updates": stats.successful_crm_updates,
+            "failed_crm_updates": stats.failed_crm_updates,
+            "emails_sent": stats.emails_sent,
+            "email_failures": stats.email_failures,
+            "ledger_skipped": stats.ledger_skipped,
+        }
+        logger.info(
+            message + " (CRM ok %d, failed %d; emails sent %d, failed %d)",
+            counts["leads_dispatched"],
+            counts["successful_crm_updates"],
+            counts["failed_crm_updates"],
+            counts["emails_sent"],
+            counts["email_failures"],
+            extra=counts,
+        )
+
+
+# Batches finished behind one that is still running or waiting for a
+# retry are held back so outcomes are recorded in input order; beyond this
+# many, dispatch waits for the head batch.
+_MAX_HELD_BATCHES = 256
+
+
+@dataclass
+class _InFlight:
+    """
+    A dispatched batch until it is recorded: its outcomes so far and, while
+    some of its leads wait for another attempt, those leads (as a smaller
+    batch) with their positions in ``batch``.
+    """
+
+    batch: Batch
+    result: Optional[_BatchResult] = None
+    attempt: int = 1
+    retry: Optional[Batch] = None
+    retry_at: Optional[List[int]] = None
+    running: bool = True
+
+    @property
+    def settled(self) -> bool:
+        return not self.running and self.retry is None
+
+
+def _retry_leads(entry: _InFlight, policy: RetryPolicy) -> Tuple[Batch, List[int]]:
+    """
+    Leads of a batch to try again, and their positions: a retryable CRM
+    failure retries the whole lead, a retryable email failure after a
+    successful (or earlier) CRM insert only the email.
+    """
+    retry: Batch = []
+    positions: List[int] = []
+    for i, (item, (crm_result, email_result)) in enumerate(zip(entry.batch, entry.result.outcomes)):
+        if crm_result is not None and crm_result.attempts < policy.max_attempts and policy.classify(crm_result):
+            retry.append(_PendingLead(item.lead))
+        elif email_result is not None and email_result.attempts < policy.max_attempts and policy.classify(email_result):
+            retry.append(_PendingLead(item.lead, skip_crm=True))
+        else:
             continue
+        positions.append(i)
+    return retry, positions
+
+
+def _merge_retry(entry: _InFlight, result: _BatchResult) -> None:
+    merged = entry.result
+    merged.crm_seconds.extend(result.crm_seconds)
+    merged.email_seconds.extend(result.email_seconds)
+    for i, (crm_result, email_result) in zip(entry.retry_at, result.outcomes):
+        old_crm, old_email = merged.outcomes[i]
+        if crm_result is None:
+            # Only the email was retried
+            email_result.attempts = old_email.attempts + 1
+            crm_result = old_crm
+        else:
+            crm_result.attempts = old_crm.attempts + 1
+        merged.outcomes[i] = (crm_result, email_result)
+
+
+class _InlineExecutor:
+    """
+    Runs each call straight away on the calling thread, so serial dispatch
+    goes through the same loop as the thread pool.
+    """
+
+    def submit(self, fn: Callable[..., _BatchResult], *args: Any) -> Future[_BatchResult]:
+        future: Future[_BatchResult] = Future()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def _dispatch_loop(
+    batches: Iterable[Batch],
+    crm_client: CRMClient,
+    email_client: EmailClient,
+    recorder: _OutcomeRecorder,
+    executor: Union[ThreadPoolExecutor, _InlineExecutor],
+    max_in_flight: int,
+    retry_policy: RetryPolicy | None,
+) -> None:
+    """
+    Run batches through ``executor``, at most ``max_in_flight`` calls at
+    once, and record their outcomes in input order.
+
+    With a ``retry_policy``, leads that failed transiently are not retried
+    on the spot: they wait in a queue ordered by when their backoff ends
+    while other batches keep going, and their batch is recorded once the
+    retries are settled.
+    """
+    batches = iter(batches)
+    pending: Deque[_InFlight] = deque()
+    running: Dict[Future[_BatchResult], _InFlight] = {}
+    waiting: List[Tuple[float, int, _InFlight]] = []
+    order = count()
+    exhausted = False
 
-        email_result: EmailResult = email_client.send_welcome_email(lead)
-        if email_result.success:
-            stats.emails_sent += 1
+    def submit(entry: _InFlight, batch: Batch) -> None:
+        entry.running = True
+        running[executor.submit(_process_batch, batch, crm_client, email_client)] = entry
+
+    def finish(entry: _InFlight, result: _BatchResult) -> None:
+        entry.running = False
+        if entry.result is None:
+            entry.result = result
         else:
-            stats.email_failures += 1
-            logger.warning("Email failed for lead", extra={"index": idx, "reason": email_result.message})
+            _merge_retry(entry, result)
+            entry.attempt += 1
+            entry.retry = entry.retry_at = None
+        if retry_policy is None:
+            return
+        retry, positions = _retry_leads(entry, retry_policy)
+        if retry:
+            entry.retry, entry.retry_at = retry, positions
+            due = time.monotonic() + retry_policy.delay(entry.attempt)
+            heapq.heappush(waiting, (due, next(order), entry))
+
+    while True:
+        while waiting and waiting[0][0] <= time.monotonic() and len(running) < max_in_flight:
+            entry = heapq.heappop(waiting)[2]
+            submit(entry, entry.retry)
+        while not exhausted and len(running) < max_in_flight and len(pending) < max_in_flight + _MAX_HELD_BATCHES:
+            batch = next(batches, None)
+            if batch is None:
+                exhausted = True
+                break
+            recorder.log_batch(batch)
+            entry = _InFlight(batch)
+            pending.append(entry)
+            submit(entry, batch)
+
+        done = [future for future in running if future.done()]
+        if not done and running and not waiting:
+            # Nothing else to start before a call finishes; the oldest one
+            # usually finishes first
+            next(iter(running)).exception()
+            done = [future for future in running if future.done()]
+        elif not done and running:
+            # Wake up for the first finished call, or when a retry is due and
+            # there is room to start it
+            timeout = None
+            if len(running) < max_in_flight:
+                timeout = max(0.0, waiting[0][0] - time.monotonic())
+            done = list(wait(running, timeout=timeout, return_when=FIRST_COMPLETED).done)
+        elif not done and waiting:
+            time.sleep(max(0.0, waiting[0][0] - time.monotonic()))
+        for future in done:
+            finish(running.pop(future), future.result())
+
+        while pending and pending[0].settled:
+            entry = pending.popleft()
+            recorder.record_batch(entry.batch, entry.result)
+        if exhausted and not pending:
+            return
+
+
+def _dispatch(
+    batches: Iterable[Batch],
+    crm_client: CRMClient,
+    email_client: EmailClient,
+    recorder: _OutcomeRecorder,
+    workers: int,
+    retry_policy: RetryPolicy | None = None,
+) -> None:
+    """
+    Dispatch batches on the calling thread (``workers == 1``) or over a
+    thread pool, with at most ``2 * workers`` batches in flight. Outcomes
+    are recorded in input order either way, so stats and log lines match
+    the serial path.
+    """
+    if retry_policy is not None and retry_policy.max_attempts == 1:
+        retry_policy = None
+    if workers == 1 and retry_policy is None:
+        for batch in batches:
+            recorder.log_batch(batch)
+            recorder.record_batch(batch, _process_batch(batch, crm_client, email_client))
+        return
+    if workers == 1:
+        _dispatch_loop(batches, crm_client, email_client, recorder, _InlineExecutor(), 1, retry_policy)
+        return
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lead-dispatch") as executor:
+        _dispatch_loop(batches, crm_client, email_client, recorder, executor, workers * 2, retry_policy)
+
+
+async def _dispatch_async(
+    batches: Iterable[Batch],
+    crm_client: CRMClient,
+    email_client: EmailClient,
+    recorder: _OutcomeRecorder,
+    concurrency: int,
+) -> None:
+    """
+    Dispatch batches as asyncio tasks, with at most ``concurrency`` batches
+    in flight. Outcomes are consumed in input order, as in ``_dispatch``.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    max_in_flight = concurrency * 2
+    pending: Deque[Tuple[Batch, asyncio.Task[_BatchResult]]] = deque()
+
+    async def process(batch: Batch) -> _BatchResult:
+        async with semaphore:
+            return await _process_batch_async(batch, crm_client, email_client)
+
+    for batch in batches:
+        recorder.log_batch(batch)
+        pending.append((batch, asyncio.create_task(process(batch))))
+        if len(pending) >= max_in_flight:
+            done_batch, task = pending.popleft()
+            recorder.record_batch(done_batch, await task)
+
+    while pending:
+        done_batch, task = pending.popleft()
+        recorder.record_batch(done_batch, await task)
+
+
+def _build_clients(
+    crm_client: CRMClient | None,
+    email_client: EmailClient | None,
+    retry_policy: RetryPolicy | None,
+    crm_guard: ClientGuard | None = None,
+    email_guard: ClientGuard | None = None,
+    log_every: int = 1,
+) -> Tuple[CRMClient, EmailClient]:
+    """
+    Default the clients and layer the optional wrappers around them.
+
+    Guards sit inside the retry layer, so every retry is paced by the rate
+    limiter and a call rejected by an open circuit is retried after the
+    backoff like any other transient failure.
+    """
+    crm_client = crm_client or MockCRMClient()
+    email_client = email_client or MockEmailClient(logger=logger, log_level=lead_log_level(log_every))
+    if crm_guard is not None:
+        crm_client = GuardedCRMClient(crm_client, crm_guard)
+    if email_guard is not None:
+        email_client = GuardedEmailClient(email_client, email_guard)
+    if retry_policy is not None and retry_policy.max_attempts > 1:
+        crm_client = RetryingCRMClient(crm_client, retry_policy)
+        email_client = RetryingEmailClient(email_client, retry_policy)
+    return crm_client, email_client
+
+
+def _collect_client_metrics(stats: PipelineStats, crm_guard: ClientGuard | None, email_guard: ClientGuard | None) -> None:
+    for name, guard in (("crm", crm_guard), ("email", email_guard)):
+        if guard is not None:
+            stats.client_metrics[name] = guard.metrics()
+
+
+def _input_label(input_excel: Inputs) -> str:
+    if isinstance(input_excel, Path):
+        return str(input_excel)
+    return os.pathsep.join(str(path) for path in input_excel)
+
+
+def _select_incremental(df: pd.DataFrame, stats: CleanupStats, incremental: IncrementalState | None) -> pd.DataFrame:
+    if incremental is None:
+        return df
+    selected, skipped = incremental.select(df)
+    stats.already_processed += skipped
+    return selected
+
+
+def _select_fuzzy(df: pd.DataFrame, stats: CleanupStats, fuzzy_dedup: FuzzyDedup | None) -> pd.DataFrame:
+    if fuzzy_dedup is None:
+        return df
+    selected, stats.fuzzy_clusters, stats.fuzzy_duplicates = fuzzy_dedup.apply(df)
+    return selected
+
+
+def _load_records(
+    input_excel: Inputs,
+    cleaned_excel: Path | None,
+    chunk_size: int | None,
+    dedup_index: EmailDedupIndex | None = None,
+    cleaned_format: str | None = None,
+    project_columns: bool = False,
+    cleanup_workers: int | None = None,
+    incremental: IncrementalState | None = None,
+    column_aliases: ColumnAliases | None = None,
+    normaliser: LeadNormaliser | None = None,
+    fuzzy_dedup: FuzzyDedup | None = None,
+) -> Tuple[Iterable[Lead], CleanupStats]:
+    """
+    Clean the input and return the leads to dispatch.
+
+    Without ``chunk_size`` the whole file is cleaned up front. With it,
+    leads are produced lazily chunk by chunk, and the returned cleanup
+    stats are complete once the leads have been consumed. Several input
+    files are always cleaned up front, in parallel. The cleaned output
+    holds every cleaned lead; ``fuzzy_dedup`` and ``incremental`` only
+    filter what is dispatched.
+    """
+    if fuzzy_dedup is not None and chunk_size is not None:
+        raise ValueError("Fuzzy dedup needs all leads at once and cannot be combined with chunk_size.")
+    if not isinstance(input_excel, Path):
+        if chunk_size is not None:
+            raise ValueError("chunk_size cannot be combined with multiple input files.")
+        cleaned_df, cleanup_stats = clean_many_leads(
+            input_excel,
+            cleaned_excel,
+            workers=cleanup_workers,
+            dedup_index=dedup_index,
+            output_format=cleaned_format,
+            project_columns=project_columns,
+            column_aliases=column_aliases,
+            normaliser=normaliser,
+        )
+        cleaned_df = _select_fuzzy(cleaned_df, cleanup_stats, fuzzy_dedup)
+        cleaned_df = _select_incremental(cleaned_df, cleanup_stats, incremental)
+        return iter_leads([cleaned_df]), cleanup_stats
+
+    if chunk_size is None:
+        cleaned_df, cleanup_stats = clean_leads(
+            input_excel,
+            cleaned_excel,
+            dedup_index=dedup_index,
+            output_format=cleaned_format,
+            project_columns=project_columns,
+            column_aliases=column_aliases,
+            normaliser=normaliser,
+        )
+        cleaned_df = _select_fuzzy(cleaned_df, cleanup_stats, fuzzy_dedup)
+        cleaned_df = _select_incremental(cleaned_df, cleanup_stats, incremental)
+        return iter_leads([cleaned_df]), cleanup_stats
+
+    chunks, cleanup_stats = stream_clean_leads(
+        input_excel,
+        cleaned_excel,
+        chunk_size=chunk_size,
+        dedup_index=dedup_index,
+        output_format=cleaned_format,
+        project_columns=project_columns,
+        column_aliases=column_aliases,
+        normaliser=normaliser,
+    )
+    if incremental is not None:
+        chunks = (_select_incremental(chunk, cleanup_stats, incremental) for chunk in chunks)
+    return iter_leads(chunks), cleanup_stats
+
+
+def _start_run(
+    input_excel: Inputs,
+    cleaned_excel: Path | None,
+    chunk_size: int | None,
+    dedup_index: EmailDedupIndex | None,
+    cleaned_format: str | None,
+    project_columns: bool,
+    checkpointer: Checkpointer | None,
+    resume: bool,
+    cleanup_workers: int | None = None,
+    incremental: IncrementalState | None = None,
+    column_aliases: ColumnAliases | None = None,
+    normaliser: LeadNormaliser | None = None,
+    fuzzy_dedup: FuzzyDedup | None = None,
+) -> Tuple[Iterable[Lead], PipelineStats, int]:
+    """
+    Produce the leads still to dispatch, the stats to continue from and
+    the cursor (number of leads already done).
+
+    On resume, the cleaned output of the interrupted run is read back when
+    it was complete; otherwise (streaming mode, or no cleaned output) the
+    input is cleaned again and the first ``cursor`` leads are skipped.
+    """
+    checkpoint = checkpointer.load() if checkpointer is not None and resume else None
+    input_label = _input_label(input_excel)
+
+    if checkpoint is None:
+        leads, cleanup_stats = _load_records(
+            input_excel,
+            cleaned_excel,
+            chunk_size,
+            dedup_index,
+            cleaned_format,
+            project_columns,
+            cleanup_workers,
+            incremental,
+            column_aliases,
+            normaliser,
+            fuzzy_dedup,
+        )
+        stats = PipelineStats(cleanup=cleanup_stats)
+        if checkpointer is not None:
+            cleanup_complete = chunk_size is None and cleaned_excel is not None
+            checkpointer.begin(
+                input_label,
+                cleaned_excel,
+                cleanup_complete=cleanup_complete,
+                cleaned_format=resolve_format(cleaned_excel, cleaned_format) if cleaned_excel is not None else None,
+            )
+            checkpointer.save(0, stats)
+        return leads, stats, 0
+
+    if checkpoint.input_path != input_label:
+        raise ValueError(f"Checkpoint {checkpointer.path} belongs to input {checkpoint.input_path}, not {input_label}.")
+
+    cursor = checkpoint.cursor
+    stats = PipelineStats.from_state(checkpoint.stats)
+    cleaned_path = Path(checkpoint.cleaned_path) if checkpoint.cleaned_path else None
+    logger.info("Resuming from checkpoint", extra={"cursor": cursor, "checkpoint": str(checkpointer.path)})
+    if incremental is not None:
+        # Transient failures before the cursor must stay out of the state
+        for key in checkpoint.incremental_discards:
+            incremental.discard(key)
+
+    if checkpoint.cleanup_complete and cleaned_path is not None and cleaned_path.exists():
+        cleaned_df = read_cleaned(cleaned_path, checkpoint.cleaned_format)
+        if dedup_index is not None:
+            # Record the cleaned leads as seen, as the interrupted run's
+            # cleanup did, since the index is saved only after a run
+            dedup_index.first_occurrences((normaliser or DEFAULT_NORMALISER).email_keys(cleaned_df["Email"]))
+        # The restored stats already count the fuzzy and incremental skips
+        cleaned_df = _select_fuzzy(cleaned_df, CleanupStats(), fuzzy_dedup)
+        cleaned_df = _select_incremental(cleaned_df, CleanupStats(), incremental)
+        leads: Iterable[Lead] = iter_leads([cleaned_df])
+        checkpointer.begin(
+            input_label, cleaned_path, cleanup_complete=True, cursor=cursor, cleaned_format=checkpoint.cleaned_format
+        )
+    else:
+        leads, stats.cleanup = _load_records(
+            input_excel,
+            cleaned_excel,
+            chunk_size,
+            dedup_index,
+            cleaned_format,
+            project_columns,
+            cleanup_workers,
+            incremental,
+            column_aliases,
+            normaliser,
+            fuzzy_dedup,
+        )
+        checkpointer.begin(input_label, cleaned_excel, cleanup_complete=False, cursor=cursor)
+
+    return islice(leads, cursor, None), stats, cursor
+
+
+def run_pipeline(
+    input_excel: Inputs,
+    cleaned_excel: Path | None,
+    report_path: Path,
+    crm_client: CRMClient | None = None,
+    email_client: EmailClient | None = None,
+    workers: int = 1,
+    batch_size: int = 1,
+    chunk_size: int | None = None,
+    dedup_index: EmailDedupIndex | None = None,
+    cleaned_format: str | None = None,
+    project_columns: bool = False,
+    ledger: LeadLedger | None = None,
+    checkpointer: Checkpointer | None = None,
+    resume: bool = False,
+    retry_policy: RetryPolicy | None = None,
+    crm_guard: ClientGuard | None = None,
+    email_guard: ClientGuard | None = None,
+    progress: ProgressCallback | None = None,
+    cleanup_workers: int | None = None,
+    incremental: IncrementalState | None = None,
+    log_every: int = 1,
+    column_aliases: ColumnAliases | None = None,
+    normaliser: LeadNormaliser | None = None,
+    fuzzy_dedup: FuzzyDedup | None = None,
+) -> PipelineStats:
+    """
+    Run the full lead processing pipeline:
+    - cleanup (Excel -> cleaned Excel, CSV, Parquet or Feather; skipped
+      when ``cleaned_excel`` is None)
+    - CRM insertion per lead
+    - welcome email after each successful CRM insert
+    - summary reporting
+
+    With ``batch_size > 1`` leads are inserted through the CRM's bulk
+    ``send_leads`` call; a failing lead still only fails itself. With
+    ``workers > 1`` batches are dispatched concurrently on a thread pool.
+    Each lead still goes CRM -> email, and the resulting stats are
+    identical to a serial run.
+
+    With ``chunk_size`` set, the input is streamed and cleaned in chunks of
+    that many rows, and leads are dispatched as each chunk is cleaned, so
+    memory stays bounded regardless of input size.
+
+    ``input_excel`` may also be a list of files: every sheet of each is
+    cleaned in parallel on ``cleanup_workers`` processes (default: one per
+    CPU) and emails are deduplicated across all of them. This mode cannot
+    be streamed.
+
+    With ``incremental`` state, only cleaned leads that are new or changed
+    since earlier runs are dispatched (the rest are counted in
+    ``already_processed``), and the state is updated once the run is done;
+    leads whose CRM insert failed transiently stay eligible for the next
+    run.
+
+    A shared ``dedup_index`` also drops leads whose email was already seen
+    by earlier runs or files using the same index. ``project_columns``
+    reads only the known lead columns from the input. ``column_aliases``
+    decides which input headers are the known columns (default: the
+    built-in aliases). ``normaliser`` sets the email keys duplicates are
+    found by (default: canonical keys) and optional phone normalisation.
+    ``fuzzy_dedup`` then looks for the same person under different emails
+    (``fuzzy.FuzzyDedup``), reporting or dropping the clusters it finds;
+    it cannot be combined with ``chunk_size``.
+
+    With a ``ledger``, leads it records as fully processed are skipped and
+    leads whose CRM insert already succeeded only get their email; every
+    outcome is recorded back into it.
+
+    A ``checkpointer`` persists the position and partial stats while leads
+    are dispatched; with ``resume=True`` a run continues from its last
+    checkpoint. The checkpoint is removed once the run completes.
+
+    With a ``retry_policy``, transient (retryable) failures are retried
+    with exponential backoff and jitter; retries are counted in
+    ``crm_retries``/``email_retries``. A lead waiting out its backoff does
+    not hold up a worker: it is queued until its retry is due while other
+    batches are dispatched, and a failed email is retried without
+    repeating the CRM insert.
+
+    ``crm_guard``/``email_guard`` apply a rate limiter and/or circuit
+    breaker to every call of that client; their state ends up in
+    ``stats.client_metrics``.
+
+    ``stats.timings`` holds the wall-clock time of the cleanup and dispatch
+    stages and latency histograms of the CRM and email calls. In streaming
+    mode cleanup happens during dispatch; ``stats.cleanup.stage_seconds``
+    breaks it down either way.
+
+    ``progress``, if given, is called with the stats after cleanup and
+    after each batch is recorded, always from the calling thread. The
+    stats object is the same one every time, updated in place.
+
+    Every lead is logged at INFO by default. With ``log_every=N`` the
+    per-lead lines go to DEBUG, a summary of the counts so far is logged
+    every N leads and a final one when dispatch ends; CRM and email
+    failures are still logged one by one.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
+
+    # Retries are scheduled by the dispatch loop rather than by wrapping the
+    # clients, so a backoff never blocks a worker
+    crm_client, email_client = _build_clients(crm_client, email_client, None, crm_guard, email_guard, log_every)
+
+    start = time.perf_counter()
+    leads, stats, cursor = _start_run(
+        input_excel,
+        cleaned_excel,
+        chunk_size,
+        dedup_index,
+        cleaned_format,
+        project_columns,
+        checkpointer,
+        resume,
+        cleanup_workers,
+        incremental,
+        column_aliases,
+        normaliser,
+        fuzzy_dedup,
+    )
+    stages = stats.timings.stage_seconds
+    stages["cleanup"] = stages.get("cleanup", 0.0) + time.perf_counter() - start
+
+    batches = _batched(leads, batch_size)
+    if ledger is not None:
+        batches = _skip_completed(batches, ledger)
+    recorder = _OutcomeRecorder(stats, ledger, checkpointer, cursor, progress, incremental, log_every)
+    if progress is not None:
+        progress(stats)
+
+    with timed(stages, "dispatch"):
+        _dispatch(batches, crm_client, email_client, recorder, workers, retry_policy)
+        recorder.finish()
+        if ledger is not None:
+            ledger.flush()
+    if incremental is not None:
+        incremental.commit()
+    _collect_client_metrics(stats, crm_guard, email_guard)
 
     write_report(stats, report_path)
+    if checkpointer is not None:
+        checkpointer.clear()
 
     return stats
 
+
+async def run_pipeline_async(
+    input_excel: Inputs,
+    cleaned_excel: Path | None,
+    report_path: Path,
+    crm_client: CRMClient | None = None,
+    email_client: EmailClient | None = None,
+    concurrency: int = 100,
+    batch_size: int = 1,
+    dedup_index: EmailDedupIndex | None = None,
+    cleaned_format: str | None = None,
+    project_columns: bool = False,
+    ledger: LeadLedger | None = None,
+    checkpointer: Checkpointer | None = None,
+    resume: bool = False,
+    retry_policy: RetryPolicy | None = None,
+    crm_guard: ClientGuard | None = None,
+    email_guard: ClientGuard | None = None,
+    progress: ProgressCallback | None = None,
+    cleanup_workers: int | None = None,
+    incremental: IncrementalState | None = None,
+    log_every: int = 1,
+    column_aliases: ColumnAliases | None = None,
+    normaliser: LeadNormaliser | None = None,
+    fuzzy_dedup: FuzzyDedup | None = None,
+) -> PipelineStats:
+    """
+    asyncio-native variant of ``run_pipeline``.
+
+    Uses the clients' ``*_async`` methods so hundreds of requests can be
+    in flight from a single thread. Cleanup and report writing are
+    blocking file work and run in a worker thread. Retries wrap the clients
+    (``retry.RetryingCRMClient``) and wait with ``asyncio.sleep`` in the
+    batch's task. The remaining options work as in ``run_pipeline``.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
+
+    crm_client, email_client = _build_clients(
+        crm_client, email_client, retry_policy, crm_guard, email_guard, log_every
+    )
+
+    start = time.perf_counter()
+    leads, stats, cursor = await asyncio.to_thread(
+        _start_run,
+        input_excel,
+        cleaned_excel,
+        None,
+        dedup_index,
+        cleaned_format,
+        project_columns,
+        checkpointer,
+        resume,
+        cleanup_workers,
+        incremental,
+        column_aliases,
+        normaliser,
+        fuzzy_dedup,
+    )
+    stages = stats.timings.stage_seconds
+    stages["cleanup"] = stages.get("cleanup", 0.0) + time.perf_counter() - start
+
+    batches = _batched(leads, batch_size)
+    if ledger is not None:
+        batches = _skip_completed(batches, ledger)
+    recorder = _OutcomeRecorder(stats, ledger, checkpointer, cursor, progress, incremental, log_every)
+    if progress is not None:
+        progress(stats)
+
+    with timed(stages, "dispatch"):
+        await _dispatch_async(batches, crm_client, email_client, recorder, concurrency)
+        recorder.finish()
+        if ledger is not None:
+            ledger.flush()
+    if incremental is not None:
+        await asyncio.to_thread(incremental.commit)
+    _collect_client_metrics(stats, crm_guard, email_guard)
+
+    await asyncio.to_thread(write_report, stats, report_path)
+    if checkpointer is not None:
+        checkpointer.clear()
+
+    return stats
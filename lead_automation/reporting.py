@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Dict
+from html import escape as html_escape
+from typing import Any, Dict, List, Tuple
 import json
 
 from .cleanup import CleanupStats
+from .timing import RunTimings
 
 
 @dataclass
@@ -15,35 +17,111 @@ class PipelineStats:
     failed_crm_updates: int = 0
     emails_sent: int = 0
     email_failures: int = 0
+    ledger_skipped: int = 0
+    ledger_email_only: int = 0
+    crm_retries: int = 0
+    email_retries: int = 0
+    # Rate limiter / circuit breaker state per client ("crm", "email").
+    client_metrics: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    timings: RunTimings = field(default_factory=RunTimings)
 
     def to_dict(self) -> Dict[str, Any]:
         base: Dict[str, Any] = {
             "total_raw_leads": self.cleanup.total_raw_leads,
             "leads_skipped": self.cleanup.leads_skipped,
             "duplicates_removed": self.cleanup.duplicates_removed,
+            "duplicates_collapsed": self.cleanup.duplicates_collapsed,
             "final_processed_leads": self.final_processed_leads,
             "successful_crm_updates": self.successful_crm_updates,
             "failed_crm_updates": self.failed_crm_updates,
             "emails_sent": self.emails_sent,
             "email_failures": self.email_failures,
+            "invalid_emails": self.cleanup.invalid_emails,
+            "phones_normalised": self.cleanup.phones_normalised,
+            "ledger_skipped": self.ledger_skipped,
+            "ledger_email_only": self.ledger_email_only,
+            "crm_retries": self.crm_retries,
+            "email_retries": self.email_retries,
+            "already_processed": self.cleanup.already_processed,
+            "fuzzy_clusters": self.cleanup.fuzzy_clusters,
+            "fuzzy_duplicates": self.cleanup.fuzzy_duplicates,
+            "sheets_skipped": self.cleanup.sheets_skipped,
         }
         return base
 
+    def sections(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Detail sections reported alongside the headline counts of
+        ``to_dict``; empty sections are left out.
+        """
+        sections: Dict[str, Dict[str, Any]] = {
+            "timings": self.timings.summary(self.cleanup.stage_seconds),
+        }
+        if self.client_metrics:
+            sections["clients"] = self.client_metrics
+        return sections
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Raw field values (including cleanup stats), for checkpoints.
+
+        Timings are left out: a resumed run reports the time and latencies
+        of its own process only.
+        """
+        state = asdict(self)
+        state.pop("timings")
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "PipelineStats":
+        state = dict(state)
+        cleanup = CleanupStats(**state.pop("cleanup"))
+        return cls(cleanup=cleanup, **state)
+
     @property
     def final_processed_leads(self) -> int:
         return self.successful_crm_updates
 
 
+def _flatten(mapping: Dict[str, Any], prefix: str = "") -> List[Tuple[str, Any]]:
+    items: List[Tuple[str, Any]] = []
+    for key, value in mapping.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            items.extend(_flatten(value, f"{name} / "))
+        else:
+            items.append((name, value))
+    return items
+
+
+def _section_html(title: str, mapping: Dict[str, Any]) -> str:
+    rows = "".join(
+        f"""
+        <tr>
+          <td class="metric-name">{html_escape(name.replace("_", " "))}</td>
+          <td class="metric-value">{html_escape(str(value))}</td>
+        </tr>"""
+        for name, value in _flatten(mapping)
+    )
+    return f"""
+    <h2>{html_escape(title.replace("_", " "))}</h2>
+    <table>
+      <tbody>{rows}
+      </tbody>
+    </table>"""
+
+
 def write_report(stats: PipelineStats, output_path: Path) -> None:
     """
     Persist the summary report as JSON and a simple HTML dashboard.
     """
     data = stats.to_dict()
+    sections = stats.sections()
 
-    # JSON output (existing behaviour)
+    # JSON output (existing behaviour); detail sections nest under their own keys
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with output_path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+        json.dump({**data, **sections}, f, indent=2)
 
     # HTML dashboard next to the JSON (e.g. report.html)
     html_path = output_path.with_suffix(".html")
@@ -133,6 +211,13 @@ def write_report(stats: PipelineStats, output_path: Path) -> None:
       border-radius: inherit;
       background: linear-gradient(90deg, #22c55e, #a3e635);
     }}
+    h2 {{
+      margin: 1.5rem 0 0 0;
+      font-size: 1.05rem;
+      letter-spacing: 0.04em;
+      text-transform: capitalize;
+      color: #cbd5f5;
+    }}
     .footer {{
       margin-top: 1.25rem;
       font-size: 0.8rem;
@@ -156,6 +241,7 @@ def write_report(stats: PipelineStats, output_path: Path) -> None:
         {''.join(rows)}
       </tbody>
     </table>
+    {''.join(_section_html(title, mapping) for title, mapping in sections.items())}
     <div class="footer">
       Opened from <code>{output_path.name}</code>. Refresh after each run to see updated numbers.
     </div>
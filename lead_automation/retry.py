@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Sequence, TypeVar, Union
+import asyncio
+import random
+import time
+
+from .clients import CRMClient, EmailClient
+from .crm import CRMResult
+from .emailer import EmailResult
+from .leads import Lead
+
+
+Result = Union[CRMResult, EmailResult]
+R = TypeVar("R", CRMResult, EmailResult)
+
+
+def is_retryable(result: Result) -> bool:
+    """
+    Default classification: only failures the client marked as transient
+    are retried.
+    """
+    return not result.success and result.retryable
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Exponential backoff with jitter.
+
+    Attempt ``n`` (counting the first call as attempt 1) is followed, if it
+    failed with a retryable result, by a wait drawn uniformly from
+    ``[(1 - jitter) * d, d]`` where ``d = min(max_delay, base_delay *
+    multiplier ** (n - 1))``. ``jitter=1`` is "full jitter", which spreads
+    retries from many leads out instead of having them arrive together.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: float = 1.0
+    classify: Callable[[Result], bool] = is_retryable
+
+    def __post_init__(self) -> None:
+        self.max_attempts = max(1, self.max_attempts)
+        self.jitter = max(0.0, min(1.0, self.jitter))
+
+    def delay(self, attempt: int) -> float:
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return random.uniform(ceiling * (1.0 - self.jitter), ceiling)
+
+
+def _call(policy: RetryPolicy, send: Callable[[Lead], R], lead: Lead) -> R:
+    attempt = 1
+    result = send(lead)
+    while attempt < policy.max_attempts and policy.classify(result):
+        time.sleep(policy.delay(attempt))
+        attempt += 1
+        result = send(lead)
+    result.attempts = attempt
+    return result
+
+
+async def _call_async(
+    policy: RetryPolicy,
+    send: Callable[[Lead], Awaitable[R]],
+    lead: Lead,
+) -> R:
+    attempt = 1
+    result = await send(lead)
+    while attempt < policy.max_attempts and policy.classify(result):
+        await asyncio.sleep(policy.delay(attempt))
+        attempt += 1
+        result = await send(lead)
+    result.attempts = attempt
+    return result
+
+
+def _call_bulk(policy: RetryPolicy, send: Callable[[Sequence[Lead]], List[R]], batch: Sequence[Lead]) -> List[R]:
+    # Only the leads whose result is retryable are sent again
+    results = send(batch)
+    attempt = 1
+    while attempt < policy.max_attempts:
+        retry_at = [i for i, result in enumerate(results) if policy.classify(result)]
+        if not retry_at:
+            break
+        time.sleep(policy.delay(attempt))
+        attempt += 1
+        for i, result in zip(retry_at, send([batch[i] for i in retry_at])):
+            result.attempts = attempt
+            results[i] = result
+    return results
+
+
+async def _call_bulk_async(
+    policy: RetryPolicy,
+    send: Callable[[Sequence[Lead]], Awaitable[List[R]]],
+    batch: Sequence[Lead],
+) -> List[R]:
+    results = await send(batch)
+    attempt = 1
+    while attempt < policy.max_attempts:
+        retry_at = [i for i, result in enumerate(results) if policy.classify(result)]
+        if not retry_at:
+            break
+        await asyncio.sleep(policy.delay(attempt))
+        attempt += 1
+        for i, result in zip(retry_at, await send([batch[i] for i in retry_at])):
+            result.attempts = attempt
+            results[i] = result
+    return results
+
+
+class RetryingCRMClient:
+    """
+    Wraps a CRM client and retries transient failures per ``policy``.
+
+    For bulk inserts only the leads that failed with a retryable result are
+    sent again, as a smaller batch. The blocking methods sleep in the
+    calling thread for the whole backoff; ``run_pipeline`` therefore does
+    not use them and schedules retries itself. The async methods wait with
+    ``asyncio.sleep``, which only suspends the calling task.
+    """
+
+    def __init__(self, inner: CRMClient, policy: RetryPolicy | None = None) -> None:
+        self.inner = inner
+        self.policy = policy or RetryPolicy()
+
+    def send_lead(self, lead: Lead) -> CRMResult:
+        return _call(self.policy, self.inner.send_lead, lead)
+
+    async def send_lead_async(self, lead: Lead) -> CRMResult:
+        return await _call_async(self.policy, self.inner.send_lead_async, lead)
+
+    def send_leads(self, batch: Sequence[Lead]) -> List[CRMResult]:
+        return _call_bulk(self.policy, self.inner.send_leads, batch)
+
+    async def send_leads_async(self, batch: Sequence[Lead]) -> List[CRMResult]:
+        return await _call_bulk_async(self.policy, self.inner.send_leads_async, batch)
+
+
+class RetryingEmailClient:
+    """
+    Wraps an email client and retries transient failures per ``policy``;
+    bulk sends resend only the failed messages, as for CRM inserts.
+    """
+
+    def __init__(self, inner: EmailClient, policy: RetryPolicy | None = None) -> None:
+        self.inner = inner
+        self.policy = policy or RetryPolicy()
+
+    def send_welcome_email(self, lead: Lead) -> EmailResult:
+        return _call(self.policy, self.inner.send_welcome_email, lead)
+
+    async def send_welcome_email_async(self, lead: Lead) -> EmailResult:
+        return await _call_async(self.policy, self.inner.send_welcome_email_async, lead)
+
+    def send_welcome_emails(self, batch: Sequence[Lead]) -> List[EmailResult]:
+        return _call_bulk(self.policy, self.inner.send_welcome_emails, batch)
+
+    async def send_welcome_emails_async(self, batch: Sequence[Lead]) -> List[EmailResult]:
+        return await _call_bulk_async(self.policy, self.inner.send_welcome_emails_async, batch)
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from typing import List, Sequence, Tuple
+import asyncio
+import logging
+import queue
+import smtplib
+import threading
+
+from .emailer import EmailResult
+from .leads import Lead
+from .templates import TemplateSet
+
+
+logger = logging.getLogger(__name__)
+
+
+class _Connection:
+    def __init__(self, smtp: smtplib.SMTP) -> None:
+        self.smtp = smtp
+        self.sent = 0
+        # Taken from the idle pool rather than freshly opened
+        self.reused = False
+
+
+class SMTPEmailClient:
+    """
+    Sends welcome emails over SMTP, reusing a small pool of connections.
+
+    Connections are opened lazily, up to ``max_connections``, and handed
+    to one call at a time; a call waits for a free one rather than opening
+    more. Each connection is reused for up to ``messages_per_connection``
+    messages and then closed with QUIT, since servers commonly cap
+    messages per session. A bulk send (``send_welcome_emails``) pushes its
+    messages through one checked-out connection (moving to a fresh one at
+    that cap), so the connect/EHLO/STARTTLS/AUTH handshake is paid once
+    per connection, not per message. A pooled connection the server
+    dropped while idle is replaced transparently.
+
+    Rejected recipients, 5xx replies and messages that cannot be sent at
+    all (e.g. a non-ASCII address when the server lacks SMTPUTF8) are
+    permanent failures of that lead only, and the connection is kept; 4xx
+    replies and lost connections are retryable. After a connection error
+    the remaining messages of a bulk send fail as retryable too, so a
+    retry policy resends them on a fresh connection.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 25,
+        sender: str = "welcome@example.com",
+        templates: TemplateSet | None = None,
+        max_connections: int = 1,
+        messages_per_connection: int = 100,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool = False,
+        timeout: float = 30.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.templates = templates or TemplateSet()
+        self.max_connections = max(1, max_connections)
+        self.messages_per_connection = max(1, messages_per_connection)
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[_Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self.connections_opened = 0
+
+    def send_welcome_email(self, lead: Lead) -> EmailResult:
+        return self.send_welcome_emails([lead])[0]
+
+    async def send_welcome_email_async(self, lead: Lead) -> EmailResult:
+        # smtplib is blocking; run it off the event loop
+        return await asyncio.to_thread(self.send_welcome_email, lead)
+
+    def send_welcome_emails(self, batch: Sequence[Lead]) -> List[EmailResult]:
+        results: List[EmailResult] = []
+        pending: List[Tuple[int, str]] = []
+        for i, lead in enumerate(batch):
+            email = str(lead.get("Email", "") or "").strip()
+            if not email or "@" not in email:
+                results.append(EmailResult(success=False, message="Invalid email address.", lead_index=lead.index))
+            else:
+                results.append(EmailResult(success=True, message="Welcome email sent.", lead_index=lead.index))
+                pending.append((i, email))
+
+        conn: _Connection | None = None
+        for position, (i, email) in enumerate(pending):
+            lead = batch[i]
+            try:
+                message = self._message(lead, email)
+            except ValueError as exc:
+                # e.g. a line break in a header value
+                results[i] = _message_failure(lead, exc)
+                continue
+            lost: BaseException | None = None
+            # A second try only happens when a pooled connection turns out
+            # to have been dropped by the server while idle.
+            for _ in range(2):
+                try:
+                    if conn is None:
+                        conn = self._checkout()
+                    conn.smtp.send_message(message, from_addr=self.sender, to_addrs=[email])
+                    conn.sent += 1
+                    lost = None
+                    break
+                except smtplib.SMTPRecipientsRefused as exc:
+                    code, reply = next(iter(exc.recipients.values()), (550, b"Recipient refused"))
+                    results[i] = _reply_failure(lead, code, reply)
+                    lost = None
+                    break
+                except smtplib.SMTPResponseException as exc:
+                    results[i] = _reply_failure(lead, exc.smtp_code, exc.smtp_error)
+                    if exc.smtp_code == 421 and conn is not None:
+                        # The server is closing the session
+                        self._discard(conn)
+                        conn = None
+                    lost = None
+                    break
+                except (smtplib.SMTPNotSupportedError, ValueError) as exc:
+                    # This message cannot be sent (e.g. a non-ASCII address
+                    # and no SMTPUTF8); the connection itself is fine
+                    results[i] = _message_failure(lead, exc)
+                    if conn is not None and not _reset(conn):
+                        self._discard(conn)
+                        conn = None
+                    lost = None
+                    break
+                except (OSError, smtplib.SMTPException) as exc:
+                    lost = exc
+                    stale = conn is not None and conn.reused
+                    if conn is not None:
+                        self._discard(conn)
+                        conn = None
+                    if not stale:
+                        break
+            if lost is not None:
+                for j, _ in pending[position:]:
+                    results[j] = _connection_failure(batch[j], lost)
+                return results
+            if conn is not None and conn.sent >= self.messages_per_connection:
+                self._checkin(conn)
+                conn = None
+
+        if conn is not None:
+            self._checkin(conn)
+        return results
+
+    async def send_welcome_emails_async(self, batch: Sequence[Lead]) -> List[EmailResult]:
+        return await asyncio.to_thread(self.send_welcome_emails, batch)
+
+    def close(self) -> None:
+        """
+        Close the idle connections (QUIT); call once dispatch is done.
+        """
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _quit(conn)
+
+    def __enter__(self) -> "SMTPEmailClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _message(self, lead: Lead, email: str) -> EmailMessage:
+        subject, body = self.templates.render(lead)
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = email
+        message["Subject"] = subject
+        message["Date"] = formatdate(localtime=True)
+        message["Message-ID"] = make_msgid()
+        message.set_content(body)
+        return message
+
+    def _connect(self) -> _Connection:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if self.starttls:
+                smtp.starttls()
+                smtp.ehlo()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+        except BaseException:
+            smtp.close()
+            raise
+        self.connections_opened += 1
+        return _Connection(smtp)
+
+    def _checkout(self) -> _Connection:
+        # A slot per connection in use; idle connections hold none
+        self._slots.acquire()
+        try:
+            conn = self._idle.get_nowait()
+            conn.reused = True
+            return conn
+        except queue.Empty:
+            pass
+        try:
+            return self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _checkin(self, conn: _Connection) -> None:
+        if conn.sent >= self.messages_per_connection:
+            _quit(conn)
+        else:
+            self._idle.put(conn)
+        self._slots.release()
+
+    def _discard(self, conn: _Connection) -> None:
+        conn.smtp.close()
+        self._slots.release()
+
+
+def _quit(conn: _Connection) -> None:
+    try:
+        conn.smtp.quit()
+    except (OSError, smtplib.SMTPException):
+        conn.smtp.close()
+
+
+def _reset(conn: _Connection) -> bool:
+    # Abandon a half-started transaction, so the next message starts clean
+    try:
+        conn.smtp.rset()
+    except (OSError, smtplib.SMTPException):
+        return False
+    return True
+
+
+def _reply_failure(lead: Lead, code: int, reply: bytes | str) -> EmailResult:
+    text = reply.decode("utf-8", "replace") if isinstance(reply, bytes) else str(reply)
+    return EmailResult(
+        success=False,
+        message=f"SMTP {code}: {text}",
+        retryable=400 <= code < 500,
+        lead_index=lead.index,
+    )
+
+
+def _connection_failure(lead: Lead, exc: BaseException) -> EmailResult:
+    return EmailResult(
+        success=False,
+        message=f"SMTP connection failed: {exc or type(exc).__name__}",
+        retryable=True,
+        lead_index=lead.index,
+    )
+
+
+def _message_failure(lead: Lead, exc: BaseException) -> EmailResult:
+    return EmailResult(
+        success=False,
+        message=f"Message not sendable: {exc or type(exc).__name__}",
+        lead_index=lead.index,
+    )
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from string import Formatter
+from typing import Any, Callable, Dict, FrozenSet, Tuple
+import json
+
+import pandas as pd
+
+from .leads import Lead
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, str):
+        return value.strip()
+    # Missing values come through as None, NaN or pd.NA
+    if value is None or pd.isna(value):
+        return ""
+    return str(value).strip()
+
+
+# Template field -> value for a lead
+FIELDS: Dict[str, Callable[[Lead], str]] = {
+    "name": lambda lead: _text(lead.name) or "there",
+    "email": lambda lead: _text(lead.email),
+    "phone": lambda lead: _text(lead.phone),
+    "source": lambda lead: _text(lead.source),
+    "created_date": lambda lead: _text(lead.created_date),
+}
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    A ``str.format``-style template (``"Hi {name}"``) parsed and checked
+    once; rendering only fills in the fields it uses.
+    """
+
+    text: str
+    fields: FrozenSet[str]
+
+    def render(self, context: Dict[str, str]) -> str:
+        return self.text.format_map(context)
+
+
+@lru_cache(maxsize=256)
+def compile_template(text: str) -> CompiledTemplate:
+    """
+    Parse ``text``; raises ValueError for unknown fields or for format
+    specs and conversions, which templates do not support. Compiled
+    templates are cached by text.
+    """
+    fields = set()
+    for _, field, spec, conversion in Formatter().parse(text):
+        if field is None:
+            continue
+        if field not in FIELDS:
+            raise ValueError(f"Unknown template field {{{field}}}; expected one of {', '.join(FIELDS)}.")
+        if spec or conversion:
+            raise ValueError(f"Template field {{{field}}} cannot have a format spec or conversion.")
+        fields.add(field)
+    return CompiledTemplate(text, frozenset(fields))
+
+
+@dataclass(frozen=True)
+class WelcomeTemplate:
+    subject: CompiledTemplate
+    body: CompiledTemplate
+
+    @classmethod
+    def from_text(cls, subject: str, body: str) -> "WelcomeTemplate":
+        return cls(compile_template(subject), compile_template(body))
+
+    def render(self, lead: Lead) -> Tuple[str, str]:
+        """
+        Subject and body for ``lead``.
+        """
+        context = {field: FIELDS[field](lead) for field in self.subject.fields | self.body.fields}
+        return self.subject.render(context), self.body.render(context)
+
+
+DEFAULT_TEMPLATE = WelcomeTemplate.from_text(
+    "Welcome to our service",
+    "Hi {name},\n\nThank you for your interest. We will be in touch shortly.\n",
+)
+
+
+def _source_key(source: Any) -> str:
+    return _text(source).casefold()
+
+
+class TemplateSet:
+    """
+    The default welcome template plus per-Source variants.
+
+    Sources are matched ignoring case and surrounding whitespace; leads
+    from other sources get the default. Templates are compiled once, when
+    the set is built, so rendering a lead costs a dict lookup and one
+    ``format_map`` per part.
+    """
+
+    def __init__(
+        self,
+        default: WelcomeTemplate = DEFAULT_TEMPLATE,
+        by_source: Dict[str, WelcomeTemplate] | None = None,
+    ) -> None:
+        self.default = default
+        self._by_source = {_source_key(source): template for source, template in (by_source or {}).items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TemplateSet":
+        """
+        Build from ``{"default": {"subject": ..., "body": ...}, "sources":
+        {"Referral": {...}}}``. A part left out of a variant is taken from
+        the default, and a part left out of the default from the built-in
+        template.
+        """
+        default_data = data.get("default", {})
+        default = WelcomeTemplate.from_text(
+            default_data.get("subject", DEFAULT_TEMPLATE.subject.text),
+            default_data.get("body", DEFAULT_TEMPLATE.body.text),
+        )
+        by_source = {
+            source: WelcomeTemplate.from_text(
+                variant.get("subject", default.subject.text),
+                variant.get("body", default.body.text),
+            )
+            for source, variant in data.get("sources", {}).items()
+        }
+        return cls(default, by_source)
+
+    @classmethod
+    def load(cls, path: Path) -> "TemplateSet":
+        with path.open("r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def for_lead(self, lead: Lead) -> WelcomeTemplate:
+        if not self._by_source:
+            return self.default
+        return self._by_source.get(_source_key(lead.source), self.default)
+
+    def render(self, lead: Lead) -> Tuple[str, str]:
+        return self.for_lead(lead).render(lead)
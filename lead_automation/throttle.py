@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence
+import asyncio
+import threading
+import time
+
+from .clients import CRMClient, EmailClient
+from .crm import CRMResult
+from .emailer import EmailResult
+from .leads import Lead
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: sustained ``rate`` calls per second, with
+    bursts of up to ``burst`` calls.
+
+    Callers reserve a token under a lock and then wait outside it for the
+    time until that token is due, so waiting threads and tasks never spin
+    and are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = rate
+        self.burst = max(1, burst if burst is not None else int(rate) or 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def _reserve(self, tokens: int = 1) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            self.acquired += tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            if wait > 0:
+                self.throttled += 1
+                self.wait_seconds += wait
+            return wait
+
+    def acquire(self, tokens: int = 1) -> None:
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 1) -> None:
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate_per_second": self.rate,
+                "burst": self.burst,
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing service.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    calls are rejected without reaching the service. Once ``cooldown``
+    seconds have passed it goes half-open and lets a single probe call
+    through: success closes it again, failure re-opens it for another
+    cooldown.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = max(0.0, cooldown)
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            if success:
+                self.consecutive_failures = 0
+                self.state = self.CLOSED
+                return
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
+
+
+class ClientGuard:
+    """
+    Rate limiter and/or circuit breaker shared by every call to one client.
+
+    Only transient (``retryable``) failures count against the breaker; a
+    lead the service rejects on its merits says nothing about the
+    service's health.
+    """
+
+    def __init__(self, rate_limiter: TokenBucket | None = None, breaker: CircuitBreaker | None = None) -> None:
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker
+
+    def before_call(self, tokens: int = 1) -> bool:
+        if self.breaker is not None and not self.breaker.allow():
+            return False
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(tokens)
+        return True
+
+    async def before_call_async(self, tokens: int = 1) -> bool:
+        if self.breaker is not None and not self.breaker.allow():
+            return False
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async(tokens)
+        return True
+
+    def after_results(self, results: Sequence[CRMResult | EmailResult]) -> None:
+        if self.breaker is None:
+            return
+        for result in results:
+            self.breaker.record(result.success or not result.retryable)
+
+    def metrics(self) -> Dict[str, Any]:
+        metrics: Dict[str, Any] = {}
+        if self.rate_limiter is not None:
+            metrics["rate_limiter"] = self.rate_limiter.metrics()
+        if self.breaker is not None:
+            metrics["circuit_breaker"] = self.breaker.metrics()
+        return metrics
+
+
+def _crm_rejected(lead: Lead) -> CRMResult:
+    return CRMResult(success=False, message="CRM circuit open; call not attempted.", retryable=True, lead_index=lead.index)
+
+
+def _email_rejected(lead: Lead) -> EmailResult:
+    return EmailResult(
+        success=False, message="Email circuit open; call not attempted.", retryable=True, lead_index=lead.index
+    )
+
+
+class GuardedCRMClient:
+    """
+    Paces calls to a CRM client through a ``ClientGuard``. A bulk insert
+    is one request, so it takes one token. Calls rejected by an open
+    circuit come back as retryable failures.
+    """
+
+    def __init__(self, inner: CRMClient, guard: ClientGuard) -> None:
+        self.inner = inner
+        self.guard = guard
+
+    def send_lead(self, lead: Lead) -> CRMResult:
+        if not self.guard.before_call():
+            return _crm_rejected(lead)
+        result = self.inner.send_lead(lead)
+        self.guard.after_results([result])
+        return result
+
+    async def send_lead_async(self, lead: Lead) -> CRMResult:
+        if not await self.guard.before_call_async():
+            return _crm_rejected(lead)
+        result = await self.inner.send_lead_async(lead)
+        self.guard.after_results([result])
+        return result
+
+    def send_leads(self, batch: Sequence[Lead]) -> List[CRMResult]:
+        if not self.guard.before_call():
+            return [_crm_rejected(lead) for lead in batch]
+        results = self.inner.send_leads(batch)
+        self.guard.after_results(results)
+        return results
+
+    async def send_leads_async(self, batch: Sequence[Lead]) -> List[CRMResult]:
+        if not await self.guard.before_call_async():
+            return [_crm_rejected(lead) for lead in batch]
+        results = await self.inner.send_leads_async(batch)
+        self.guard.after_results(results)
+        return results
+
+
+class GuardedEmailClient:
+    """
+    Paces calls to an email client through a ``ClientGuard``. Provider
+    quotas count messages, so a bulk send takes one token per message.
+    """
+
+    def __init__(self, inner: EmailClient, guard: ClientGuard) -> None:
+        self.inner = inner
+        self.guard = guard
+
+    def send_welcome_email(self, lead: Lead) -> EmailResult:
+        if not self.guard.before_call():
+            return _email_rejected(lead)
+        result = self.inner.send_welcome_email(lead)
+        self.guard.after_results([result])
+        return result
+
+    async def send_welcome_email_async(self, lead: Lead) -> EmailResult:
+        if not await self.guard.before_call_async():
+            return _email_rejected(lead)
+        result = await self.inner.send_welcome_email_async(lead)
+        self.guard.after_results([result])
+        return result
+
+    def send_welcome_emails(self, batch: Sequence[Lead]) -> List[EmailResult]:
+        if not self.guard.before_call(len(batch)):
+            return [_email_rejected(lead) for lead in batch]
+        results = self.inner.send_welcome_emails(batch)
+        self.guard.after_results(results)
+        return results
+
+    async def send_welcome_emails_async(self, batch: Sequence[Lead]) -> List[EmailResult]:
+        if not await self.guard.before_call_async(len(batch)):
+            return [_email_rejected(lead) for lead in batch]
+        results = await self.inner.send_welcome_emails_async(batch)
+        self.guard.after_results(results)
+        return results
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, TypeVar
+import math
+import time
+
+T = TypeVar("T")
+
+# Log-spaced latency buckets: 8 per doubling (~9% wide) from 1µs up to
+# 2^34 µs, about 4.8 hours; anything outside lands in the first/last bucket.
+_MIN_SECONDS = 1e-6
+_BUCKETS_PER_DOUBLING = 8
+_BUCKET_COUNT = 272
+_LOG_STEP = math.log(2) / _BUCKETS_PER_DOUBLING
+
+
+def _bucket(seconds: float) -> int:
+    if seconds <= _MIN_SECONDS:
+        return 0
+    return min(_BUCKET_COUNT - 1, int(math.log(seconds / _MIN_SECONDS) / _LOG_STEP))
+
+
+def _bucket_upper(index: int) -> float:
+    return _MIN_SECONDS * math.exp((index + 1) * _LOG_STEP)
+
+
+@dataclass
+class LatencyHistogram:
+    """
+    Fixed-size histogram of call latencies.
+
+    Recording is a log and a list increment, cheap enough for the per-lead
+    hot loop, and percentiles are accurate to one bucket (~9%). Not
+    thread-safe; the pipeline records from one thread.
+    """
+
+    counts: List[int] = field(default_factory=lambda: [0] * _BUCKET_COUNT)
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[_bucket(seconds)] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def percentile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the ``q``-th percentile (0-100),
+        capped at the largest recorded value.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_bucket_upper(index), self.max_seconds)
+        return self.max_seconds
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Count plus mean/p50/p95/p99/max in milliseconds.
+        """
+        def ms(seconds: float) -> float:
+            return round(seconds * 1000, 3)
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.total_seconds / self.count) if self.count else 0.0,
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+            "p99_ms": ms(self.percentile(99)),
+            "max_ms": ms(self.max_seconds),
+        }
+
+
+@dataclass
+class RunTimings:
+    """
+    Wall-clock seconds per pipeline stage and latency histograms for the
+    CRM and email calls, one sample per attempt: rate-limit waits are
+    included, backoff between retries is not (``run_pipeline_async``
+    retries inside the call, so there a sample covers all attempts). A
+    bulk ``send_leads`` call counts as one CRM call. Only ``leads_dispatched`` leads count towards throughput;
+    leads skipped through the ledger or a checkpoint do not.
+    """
+
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    crm: LatencyHistogram = field(default_factory=LatencyHistogram)
+    email: LatencyHistogram = field(default_factory=LatencyHistogram)
+    leads_dispatched: int = 0
+
+    def summary(self, cleanup_stage_seconds: Dict[str, float] | None = None) -> Dict[str, Any]:
+        dispatch_seconds = self.stage_seconds.get("dispatch", 0.0)
+        throughput = self.leads_dispatched / dispatch_seconds if dispatch_seconds > 0 else 0.0
+        summary: Dict[str, Any] = {
+            "stage_seconds": {name: round(seconds, 3) for name, seconds in self.stage_seconds.items()},
+        }
+        if cleanup_stage_seconds:
+            summary["cleanup_stage_seconds"] = {
+                name: round(seconds, 3) for name, seconds in cleanup_stage_seconds.items()
+            }
+        summary["leads_dispatched"] = self.leads_dispatched
+        summary["throughput_leads_per_second"] = round(throughput, 2)
+        summary["crm_latency"] = self.crm.summary()
+        summary["email_latency"] = self.email.summary()
+        return summary
+
+
+@contextmanager
+def timed(stages: Dict[str, float], name: str) -> Iterator[None]:
+    """
+    Add the wall-clock time of the block to ``stages[name]``.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages[name] = stages.get(name, 0.0) + time.perf_counter() - start
+
+
+def timed_iter(items: Iterable[T], stages: Dict[str, float], name: str) -> Iterator[T]:
+    """
+    Yield from ``items``, adding the time spent producing each item (not
+    the time the consumer holds it) to ``stages[name]``.
+    """
+    iterator = iter(items)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            stages[name] = stages.get(name, 0.0) + time.perf_counter() - start
+        yield item
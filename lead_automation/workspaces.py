@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+import re
+import shutil
+import threading
+import time
+import uuid
+
+
+_WORKSPACE_ID = re.compile(r"^[0-9a-f]{12}$")
+
+
+@dataclass
+class Workspace:
+    id: str
+    path: Path
+
+
+class WorkspaceManager:
+    """
+    Per-upload working directories under one root, removed once they
+    expire.
+
+    A workspace expires ``ttl_seconds`` after the newest file in it was
+    last modified. ``maybe_sweep`` removes expired workspaces at most once
+    every ``sweep_interval`` seconds, so it is cheap to call on every
+    request; ids passed as ``keep`` (e.g. jobs still running) are never
+    removed.
+    """
+
+    def __init__(self, root: Path, ttl_seconds: float = 6 * 3600, sweep_interval: float = 300.0) -> None:
+        root.mkdir(parents=True, exist_ok=True)
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        self._last_sweep = float("-inf")
+
+    def create(self) -> Workspace:
+        workspace_id = uuid.uuid4().hex[:12]
+        path = self.root / workspace_id
+        path.mkdir()
+        return Workspace(workspace_id, path)
+
+    def get(self, workspace_id: str) -> Workspace | None:
+        # Ids come from URLs; only accept ones ``create`` could have made
+        if not _WORKSPACE_ID.match(workspace_id):
+            return None
+        path = self.root / workspace_id
+        return Workspace(workspace_id, path) if path.is_dir() else None
+
+    def discard(self, workspace: Workspace) -> None:
+        shutil.rmtree(workspace.path, ignore_errors=True)
+
+    def expires_at(self, workspace: Workspace) -> float:
+        return self._last_modified(workspace.path) + self.ttl_seconds
+
+    def sweep(self, keep: Iterable[str] = ()) -> int:
+        """
+        Remove expired workspaces now; returns how many were removed.
+        """
+        keep = set(keep)
+        cutoff = time.time() - self.ttl_seconds
+        removed = 0
+        for path in self.root.iterdir():
+            if not path.is_dir() or path.name in keep:
+                continue
+            if self._last_modified(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def maybe_sweep(self, keep: Iterable[str] = ()) -> int:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_sweep < self.sweep_interval:
+                return 0
+            self._last_sweep = now
+        return self.sweep(keep)
+
+    @staticmethod
+    def _last_modified(path: Path) -> float:
+        try:
+            latest = path.stat().st_mtime
+            for child in path.iterdir():
+                latest = max(latest, child.stat().st_mtime)
+        except FileNotFoundError:
+            # Removed by a concurrent sweep or discard
+            return float("-inf")
+        return latest
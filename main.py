@@ -1,20 +1,34 @@
 from __future__ import annotations
 
+from logging.handlers import QueueListener
 from pathlib import Path
 import argparse
+import glob
 import logging
+import os
 import sys
 
-from lead_automation.pipeline import run_pipeline
+from lead_automation.checkpoint import Checkpointer
+from lead_automation.columns import DEFAULT_FUZZY_CUTOFF, ColumnAliases
+from lead_automation.dedup import EmailDedupIndex
+from lead_automation.emailer import MockEmailClient
+from lead_automation.fuzzy import FUZZY_MODES, FuzzyDedup
+from lead_automation.incremental import INCREMENTAL_MODES, IncrementalState
+from lead_automation.ledger import LeadLedger
+from lead_automation.logs import LOG_FORMATS, start_queue_logging
+from lead_automation.metrics import MetricsRegistry
+from lead_automation.normalise import LeadNormaliser
+from lead_automation.outputs import CLEANED_FORMATS
+from lead_automation.pipeline import lead_log_level, run_pipeline
+from lead_automation.retry import RetryPolicy
+from lead_automation.smtp import SMTPEmailClient
+from lead_automation.templates import TemplateSet
+from lead_automation.throttle import CircuitBreaker, ClientGuard, TokenBucket
 
 
-def configure_logging(verbose: bool = False) -> None:
+def configure_logging(verbose: bool = False, log_format: str = "text") -> QueueListener:
     level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
-        stream=sys.stdout,
-    )
+    return start_queue_logging(log_format, level)
 
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -25,11 +39,41 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         default=Path("leads.xlsx"),
         help="Path to raw leads Excel file (default: leads.xlsx in current directory).",
     )
+    parser.add_argument(
+        "--input-dir",
+        type=Path,
+        default=None,
+        help="Process every workbook in this folder (all sheets) instead of --input; see --input-glob.",
+    )
+    parser.add_argument(
+        "--input-glob",
+        default=None,
+        help="Glob selecting the input files: within --input-dir (default there: *.xlsx), "
+        "or on its own, e.g. 'regions/*.xlsx'.",
+    )
+    parser.add_argument(
+        "--cleanup-processes",
+        type=int,
+        default=None,
+        help="Processes used to clean multiple input files/sheets in parallel (default: one per CPU).",
+    )
     parser.add_argument(
         "--cleaned-output",
         type=Path,
-        default=Path("cleaned_leads.xlsx"),
-        help="Where to write the cleaned leads Excel file (default: cleaned_leads.xlsx).",
+        default=None,
+        help="Where to write the cleaned leads file; the format follows the extension "
+        "(default: cleaned_leads.xlsx, or cleaned_leads.<format> with --cleaned-format).",
+    )
+    parser.add_argument(
+        "--cleaned-format",
+        choices=CLEANED_FORMATS,
+        default=None,
+        help="Format of the cleaned leads file (xlsx, csv, parquet, feather). Parquet/Feather need pyarrow.",
+    )
+    parser.add_argument(
+        "--no-cleaned-output",
+        action="store_true",
+        help="Skip writing the cleaned leads file entirely.",
     )
     parser.add_argument(
         "--report",
@@ -37,39 +81,411 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         default=Path("report.json"),
         help="Where to write the JSON summary report (default: report.json).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of leads to dispatch to the CRM/email clients concurrently (default: 1, serial).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Number of leads per bulk CRM insert and bulk welcome-email send (default: 1, one call per lead).",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="Stream the input in chunks of this many rows instead of loading it whole (bounded memory).",
+    )
+    parser.add_argument(
+        "--project-columns",
+        action="store_true",
+        help="Only read the Name/Email/Phone/Source/Created Date columns; other columns are dropped.",
+    )
+    parser.add_argument(
+        "--column-aliases",
+        type=Path,
+        default=None,
+        help='JSON file of extra header aliases per column, e.g. {"Email": ["Courriel"]} (added to the built-ins).',
+    )
+    parser.add_argument(
+        "--fuzzy-columns",
+        type=float,
+        nargs="?",
+        const=DEFAULT_FUZZY_CUTOFF,
+        default=None,
+        metavar="CUTOFF",
+        help=f"Match unrecognised headers to the closest alias scoring at least CUTOFF (0-1, default "
+        f"{DEFAULT_FUZZY_CUTOFF}).",
+    )
+    parser.add_argument(
+        "--exact-email-dedup",
+        action="store_true",
+        help="Only treat identical (trimmed) emails as duplicates, instead of canonical keys that also match "
+        "case, Gmail dot and +tag variants.",
+    )
+    parser.add_argument(
+        "--phone-country-code",
+        default=None,
+        metavar="CC",
+        help="Rewrite Phone values to E.164, taking numbers without +/00 as national numbers of this country "
+        "code (e.g. 1, 44). Default: phones are left as they are.",
+    )
+    parser.add_argument(
+        "--fuzzy-dedup",
+        choices=FUZZY_MODES,
+        default=None,
+        help="Look for the same person under different emails (similar name, same phone, similar address): "
+        "'report' counts the clusters, 'drop' also dispatches only the first lead of each.",
+    )
+    parser.add_argument(
+        "--fuzzy-threshold",
+        type=float,
+        default=0.85,
+        help="Minimum similarity score (0-1) for two leads to count as the same person (default: 0.85).",
+    )
+    parser.add_argument(
+        "--fuzzy-max-block",
+        type=int,
+        default=50,
+        help="Skip blocking groups (same phone, name key or email domain) larger than this (default: 50).",
+    )
+    parser.add_argument(
+        "--dedup-index",
+        type=Path,
+        default=None,
+        help="Persistent email dedup index; leads whose email was seen by earlier runs are dropped as duplicates.",
+    )
+    parser.add_argument(
+        "--incremental-state",
+        type=Path,
+        default=None,
+        help="Only dispatch leads that are new or changed since earlier runs using this state file "
+        "(e.g. leads_state.npz); for cumulative daily exports.",
+    )
+    parser.add_argument(
+        "--incremental-by",
+        choices=INCREMENTAL_MODES,
+        default="fingerprint",
+        help="How --incremental-state detects new leads: per-email row fingerprints (default, also catches "
+        "edited rows) or a Created Date watermark.",
+    )
+    parser.add_argument(
+        "--ledger",
+        type=Path,
+        default=None,
+        help="SQLite ledger of leads already sent; reruns skip leads it records as done.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Where to keep the progress checkpoint (default: next to the report, e.g. report.checkpoint.json).",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=1000,
+        help="Write a checkpoint every N dispatched leads (default: 1000).",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=30.0,
+        help="Write a checkpoint at least every N seconds (default: 30).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its checkpoint instead of starting over.",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=1,
+        help="Attempts per CRM/email call for transient failures, with exponential backoff (default: 1, no retries).",
+    )
+    parser.add_argument(
+        "--retry-base-delay",
+        type=float,
+        default=0.5,
+        help="Backoff before the first retry in seconds, doubled per attempt and jittered (default: 0.5).",
+    )
+    parser.add_argument(
+        "--retry-max-delay",
+        type=float,
+        default=30.0,
+        help="Upper bound on the backoff between retries in seconds (default: 30).",
+    )
+    parser.add_argument(
+        "--crm-rate-limit",
+        type=float,
+        default=None,
+        help="Maximum CRM requests per second (token bucket; default: unlimited).",
+    )
+    parser.add_argument(
+        "--crm-burst",
+        type=int,
+        default=None,
+        help="CRM requests allowed in a burst above the rate (default: one second's worth).",
+    )
+    parser.add_argument(
+        "--email-rate-limit",
+        type=float,
+        default=None,
+        help="Maximum email sends per second (token bucket; default: unlimited).",
+    )
+    parser.add_argument(
+        "--email-burst",
+        type=int,
+        default=None,
+        help="Email sends allowed in a burst above the rate (default: one second's worth).",
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=0,
+        help="Open a client's circuit after N consecutive transient failures (default: 0, disabled).",
+    )
+    parser.add_argument(
+        "--breaker-cooldown",
+        type=float,
+        default=30.0,
+        help="Seconds an open circuit waits before letting a probe call through (default: 30).",
+    )
+    parser.add_argument(
+        "--email-templates",
+        type=Path,
+        default=None,
+        help="JSON file with the welcome email template and per-Source variants (default: built-in template).",
+    )
+    parser.add_argument(
+        "--smtp-host",
+        default=None,
+        help="Deliver welcome emails through this SMTP server instead of logging them.",
+    )
+    parser.add_argument("--smtp-port", type=int, default=25, help="SMTP server port (default: 25).")
+    parser.add_argument(
+        "--smtp-from",
+        default="welcome@example.com",
+        help="Sender address of the welcome emails (default: welcome@example.com).",
+    )
+    parser.add_argument(
+        "--smtp-user",
+        default=None,
+        help="SMTP login user; the password is read from the SMTP_PASSWORD environment variable.",
+    )
+    parser.add_argument("--smtp-starttls", action="store_true", help="Upgrade SMTP connections with STARTTLS.")
+    parser.add_argument(
+        "--smtp-connections",
+        type=int,
+        default=1,
+        help="Maximum pooled SMTP connections (default: 1); match it to --workers to send in parallel.",
+    )
+    parser.add_argument(
+        "--smtp-messages-per-connection",
+        type=int,
+        default=100,
+        help="Messages sent over one SMTP connection before it is closed and reopened (default: 100).",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        default=None,
+        help="Also write run metrics in Prometheus text format here (e.g. for node_exporter's textfile collector).",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
         help="Enable verbose logging.",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--log-format",
+        choices=LOG_FORMATS,
+        default="text",
+        help="Log line format: human-readable text (default) or one JSON object per line.",
+    )
+    parser.add_argument(
+        "--log-every",
+        type=int,
+        default=1,
+        help="Log a progress summary every N leads, plus a final one, instead of a line per lead (default: 1, "
+        "a line per lead; sampled-out per-lead lines are still logged with --verbose). Failures are always logged.",
+    )
+    args = parser.parse_args(argv)
+    if args.no_cleaned_output:
+        args.cleaned_output = None
+    elif args.cleaned_output is None:
+        args.cleaned_output = Path(f"cleaned_leads.{args.cleaned_format or 'xlsx'}")
+    if args.checkpoint is None:
+        args.checkpoint = args.report.with_suffix(".checkpoint.json")
+    return args
+
+
+def resolve_inputs(args: argparse.Namespace) -> Path | list[Path]:
+    """
+    The single --input file, or the sorted files selected by --input-dir
+    and/or --input-glob.
+    """
+    if args.input_dir is not None:
+        return sorted(path for path in args.input_dir.glob(args.input_glob or "*.xlsx") if path.is_file())
+    if args.input_glob is not None:
+        return sorted(Path(path) for path in glob.glob(args.input_glob) if Path(path).is_file())
+    return args.input
+
+
+def build_guard(
+    rate: float | None,
+    burst: int | None,
+    breaker_threshold: int,
+    breaker_cooldown: float,
+) -> ClientGuard | None:
+    rate_limiter = TokenBucket(rate, burst) if rate else None
+    breaker = CircuitBreaker(breaker_threshold, breaker_cooldown) if breaker_threshold > 0 else None
+    if rate_limiter is None and breaker is None:
+        return None
+    return ClientGuard(rate_limiter, breaker)
+
+
+def build_column_aliases(args: argparse.Namespace) -> ColumnAliases | None:
+    if args.column_aliases is not None:
+        return ColumnAliases.load(args.column_aliases, args.fuzzy_columns)
+    if args.fuzzy_columns is not None:
+        return ColumnAliases(fuzzy_cutoff=args.fuzzy_columns)
+    return None
+
+
+def build_email_client(args: argparse.Namespace) -> MockEmailClient | SMTPEmailClient | None:
+    templates = TemplateSet.load(args.email_templates) if args.email_templates is not None else None
+    if args.smtp_host:
+        return SMTPEmailClient(
+            args.smtp_host,
+            args.smtp_port,
+            sender=args.smtp_from,
+            templates=templates,
+            max_connections=args.smtp_connections,
+            messages_per_connection=args.smtp_messages_per_connection,
+            username=args.smtp_user,
+            password=os.environ.get("SMTP_PASSWORD"),
+            starttls=args.smtp_starttls,
+        )
+    if templates is not None:
+        return MockEmailClient(templates=templates, log_level=lead_log_level(args.log_every))
+    return None
 
 
 def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv)
-    configure_logging(verbose=args.verbose)
+    log_listener = configure_logging(verbose=args.verbose, log_format=args.log_format)
 
+    ledger: LeadLedger | None = None
+    metrics_registry: MetricsRegistry | None = None
+    run_progress = None
+    error = None
+    email_client = None
     try:
+        inputs = resolve_inputs(args)
+        if isinstance(inputs, list) and not inputs:
+            print("No input files matched --input-dir/--input-glob.", file=sys.stderr)
+            return 1
+
+        ledger = LeadLedger(args.ledger) if args.ledger is not None else None
+        checkpointer = Checkpointer(
+            args.checkpoint,
+            every_leads=args.checkpoint_every,
+            every_seconds=args.checkpoint_interval,
+        )
+        metrics_registry = MetricsRegistry() if args.metrics_file is not None else None
+        run_progress = metrics_registry.start_run("cli") if metrics_registry is not None else None
+        email_client = build_email_client(args)
+        dedup_index = None
+        if args.dedup_index is not None:
+            dedup_index = EmailDedupIndex.load(args.dedup_index) if args.dedup_index.exists() else EmailDedupIndex()
+
         stats = run_pipeline(
-            input_excel=args.input,
+            input_excel=inputs,
             cleaned_excel=args.cleaned_output,
             report_path=args.report,
+            email_client=email_client,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            chunk_size=args.chunk_size,
+            dedup_index=dedup_index,
+            cleaned_format=args.cleaned_format,
+            project_columns=args.project_columns,
+            column_aliases=build_column_aliases(args),
+            normaliser=LeadNormaliser(
+                canonical_emails=not args.exact_email_dedup,
+                phone_country_code=args.phone_country_code,
+            ),
+            fuzzy_dedup=(
+                FuzzyDedup(args.fuzzy_dedup, args.fuzzy_threshold, args.fuzzy_max_block)
+                if args.fuzzy_dedup is not None
+                else None
+            ),
+            ledger=ledger,
+            checkpointer=checkpointer,
+            resume=args.resume,
+            retry_policy=RetryPolicy(
+                max_attempts=args.max_attempts,
+                base_delay=args.retry_base_delay,
+                max_delay=args.retry_max_delay,
+            ),
+            crm_guard=build_guard(args.crm_rate_limit, args.crm_burst, args.breaker_threshold, args.breaker_cooldown),
+            email_guard=build_guard(
+                args.email_rate_limit, args.email_burst, args.breaker_threshold, args.breaker_cooldown
+            ),
+            progress=run_progress.update if run_progress is not None else None,
+            cleanup_workers=args.cleanup_processes,
+            incremental=(
+                IncrementalState(args.incremental_state, mode=args.incremental_by)
+                if args.incremental_state is not None
+                else None
+            ),
+            log_every=args.log_every,
         )
+
+        if dedup_index is not None:
+            dedup_index.save(args.dedup_index)
     except FileNotFoundError as exc:
+        error = str(exc)
         print(f"Input Excel file not found: {exc}", file=sys.stderr)
         return 1
     except Exception as exc:  # noqa: BLE001
+        error = str(exc) or type(exc).__name__
         print(f"Unexpected error while running pipeline: {exc}", file=sys.stderr)
         return 1
+    finally:
+        if ledger is not None:
+            ledger.close()
+        if isinstance(email_client, SMTPEmailClient):
+            email_client.close()
+        if metrics_registry is not None:
+            metrics_registry.finish_run(run_progress, error=error)
+            metrics_registry.write_textfile(args.metrics_file)
+        # Flush queued log lines before the summary below
+        log_listener.stop()
 
     print("Pipeline completed successfully.")
     print(f"Summary report written to: {args.report}")
     print(
         f"Total raw leads: {stats.cleanup.total_raw_leads}, "
         f"Leads skipped: {stats.cleanup.leads_skipped}, "
-        f"Duplicates removed: {stats.cleanup.duplicates_removed}, "
+        f"Duplicates removed: {stats.cleanup.duplicates_removed} "
+        f"({stats.cleanup.duplicates_collapsed} by canonical email), "
         f"Final processed leads: {stats.final_processed_leads}",
     )
+    if stats.cleanup.sheets_skipped:
+        print(f"Sheets skipped (no Email column): {stats.cleanup.sheets_skipped}")
+    if args.incremental_state is not None:
+        print(f"Already processed by earlier runs (skipped): {stats.cleanup.already_processed}")
+    if args.fuzzy_dedup is not None:
+        print(
+            f"Fuzzy duplicates: {stats.cleanup.fuzzy_duplicates} leads in {stats.cleanup.fuzzy_clusters} clusters"
+            + (" (dropped)" if args.fuzzy_dedup == "drop" else ""),
+        )
 
     return 0
 
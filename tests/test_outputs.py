@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from lead_automation.cleanup import stream_clean_leads
+
+pytest.importorskip("pyarrow")
+
+
+def _leads_with_blank_first_chunk(path: Path) -> None:
+    pd.DataFrame(
+        {
+            "Name": ["A", "B", "C", "D", "E", "F"],
+            "Email": ["a@x.com", "b@x.com", "c@x.com", "d@x.com", "e@x.com", "f@x.com"],
+            "Phone": [None, None, None, 5551234567, "555-123-4568", None],
+            "Score": [None, None, None, 1, 2.5, 3],
+        }
+    ).to_excel(path, index=False)
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".feather"])
+def test_streamed_arrow_output_with_null_first_chunk(tmp_path: Path, suffix: str) -> None:
+    source = tmp_path / "leads.xlsx"
+    output = tmp_path / f"cleaned{suffix}"
+    _leads_with_blank_first_chunk(source)
+
+    chunks, stats = stream_clean_leads(source, output, chunk_size=3)
+    for _ in chunks:
+        pass
+
+    df = pd.read_parquet(output) if suffix == ".parquet" else pd.read_feather(output)
+    assert stats.total_raw_leads == 6
+    assert df["Email"].tolist() == ["a@x.com", "b@x.com", "c@x.com", "d@x.com", "e@x.com", "f@x.com"]
+    assert df["Phone"].isna().tolist() == [True, True, True, False, False, True]
+    assert df["Phone"].iloc[3:5].tolist() == ["5551234567", "555-123-4568"]
+    # Blank in the first chunk, so the column is written as text
+    assert df["Score"].iloc[3:].tolist() == ["1.0", "2.5", "3.0"]
+
+
+@pytest.mark.parametrize("project_columns", [False, True])
+def test_streamed_feather_input(tmp_path: Path, project_columns: bool) -> None:
+    import pyarrow as pa
+    import pyarrow.feather
+
+    source = tmp_path / "leads.feather"
+    output = tmp_path / "cleaned.csv"
+    leads = pd.DataFrame(
+        {
+            "Name": ["A", "B", "C", "D", "E"],
+            "E-mail": ["a@x.com", "b@x.com", "A@x.com", None, "e@x.com"],
+            "Notes": ["1", "2", "3", "4", "5"],
+        }
+    )
+    # Several record batches, none a multiple of the chunk size
+    pyarrow.feather.write_feather(pa.Table.from_pandas(leads, preserve_index=False), source, chunksize=3)
+
+    chunks, stats = stream_clean_leads(source, output, chunk_size=2, project_columns=project_columns)
+    streamed = pd.concat(list(chunks), ignore_index=True)
+
+    assert stats.total_raw_leads == 5
+    assert stats.leads_skipped_missing_email == 1
+    assert stats.duplicates_removed == 1
+    assert streamed["Email"].tolist() == ["a@x.com", "b@x.com", "e@x.com"]
+    assert ("Notes" in streamed.columns) is not project_columns
+    assert pd.read_csv(output)["Email"].tolist() == ["a@x.com", "b@x.com", "e@x.com"]
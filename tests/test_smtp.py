@@ -0,0 +1,124 @@
+from typing import Iterator, List
+import socketserver
+import threading
+
+import pytest
+
+from lead_automation.leads import Lead
+from lead_automation.smtp import SMTPEmailClient
+
+
+class _StubSMTPHandler(socketserver.StreamRequestHandler):
+    # Just enough SMTP for smtplib: no SMTPUTF8, and any recipient
+    # containing "bounce" is refused with 550
+    def handle(self) -> None:
+        server: _StubSMTPServer = self.server  # type: ignore[assignment]
+        with server.lock:
+            server.connections += 1
+        self._reply("220 stub ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("ascii", "replace").strip()
+            verb = command[:4].upper()
+            if verb == "EHLO":
+                self._reply("250-stub", "250 8BITMIME")
+            elif verb == "RCPT" and "bounce" in command.lower():
+                self._reply("550 No such user")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with server.lock:
+                    server.messages += 1
+                self._reply("250 Queued")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                # HELO, MAIL, RCPT, RSET, NOOP
+                self._reply("250 OK")
+
+    def _reply(self, *lines: str) -> None:
+        self.wfile.write("".join(f"{line}\r\n" for line in lines).encode("ascii"))
+
+
+class _StubSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _StubSMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+
+
+@pytest.fixture
+def smtp_server() -> Iterator[_StubSMTPServer]:
+    server = _StubSMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def _client(server: _StubSMTPServer, **kwargs: int) -> SMTPEmailClient:
+    return SMTPEmailClient("127.0.0.1", server.server_address[1], timeout=5.0, **kwargs)
+
+
+def _leads(*emails: str) -> List[Lead]:
+    return [Lead(i, name=f"Lead {i}", email=email) for i, email in enumerate(emails, start=1)]
+
+
+def test_connection_reused_across_sends(smtp_server: _StubSMTPServer) -> None:
+    with _client(smtp_server) as client:
+        for lead in _leads("a@x.com", "b@x.com", "c@x.com"):
+            assert client.send_welcome_email(lead).success
+        assert all(result.success for result in client.send_welcome_emails(_leads("d@x.com", "e@x.com")))
+        assert client.connections_opened == 1
+
+    assert smtp_server.messages == 5
+    assert smtp_server.connections == 1
+
+
+def test_reconnects_after_messages_per_connection(smtp_server: _StubSMTPServer) -> None:
+    with _client(smtp_server, messages_per_connection=2) as client:
+        results = client.send_welcome_emails(_leads("a@x.com", "b@x.com", "c@x.com", "d@x.com", "e@x.com"))
+        assert all(result.success for result in results)
+        assert client.connections_opened == 3
+
+    assert smtp_server.messages == 5
+    assert smtp_server.connections == 3
+
+
+def test_refused_recipient_is_a_failed_send(smtp_server: _StubSMTPServer) -> None:
+    with _client(smtp_server) as client:
+        results = client.send_welcome_emails(_leads("a@x.com", "bounce@x.com", "c@x.com"))
+        assert client.connections_opened == 1
+
+    refused = results[1]
+    assert not refused.success and not refused.retryable
+    assert refused.message.startswith("SMTP 550")
+    assert refused.lead_index == 2
+    assert results[0].success and results[2].success
+    assert smtp_server.messages == 2
+
+
+def test_unsendable_message_keeps_the_connection(smtp_server: _StubSMTPServer) -> None:
+    # A non-ASCII address needs SMTPUTF8, which the stub does not offer
+    with _client(smtp_server) as client:
+        results = client.send_welcome_emails(_leads("a@x.com", "jörg@x.com", "c@x.com"))
+        assert client.connections_opened == 1
+
+    unsendable = results[1]
+    assert not unsendable.success and not unsendable.retryable
+    assert unsendable.message.startswith("Message not sendable")
+    assert results[0].success and results[2].success
+    assert smtp_server.messages == 2
+    assert smtp_server.connections == 1
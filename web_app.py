@@ -1,14 +1,77 @@
 from __future__ import annotations
 
+from datetime import datetime
 from pathlib import Path
+import os
 import tempfile
+import threading
 
-from flask import Flask, request, render_template_string
+from flask import Flask, Request, Response, abort, jsonify, redirect, request, render_template_string, send_file
+from werkzeug.exceptions import RequestEntityTooLarge, UnsupportedMediaType
 
-from lead_automation.pipeline import run_pipeline
+from lead_automation.jobs import FAILED, SUCCEEDED, JobQueue, QueueFull
+from lead_automation.metrics import MetricsRegistry
+from lead_automation.workspaces import Workspace, WorkspaceManager
+
+
+# .xlsx workbooks are zip archives
+XLSX_MAGIC = b"PK\x03\x04"
+
+# Files of a finished job that can be downloaded until its workspace expires
+DOWNLOADS = ("cleaned_leads.xlsx", "report.json", "report.html")
+
+
+class _UploadSink:
+    """
+    File object Werkzeug streams an uploaded file into, on disk in the
+    request's workspace. The first bytes are checked against the .xlsx
+    signature, so other content is rejected before the rest is read.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._file = path.open("w+b")
+        self._head = b""
+
+    def write(self, data: bytes) -> int:
+        if len(self._head) < len(XLSX_MAGIC):
+            self._head += data[: len(XLSX_MAGIC) - len(self._head)]
+            if not XLSX_MAGIC.startswith(self._head):
+                self._file.close()
+                raise UnsupportedMediaType("File is not an .xlsx Excel workbook.")
+        return self._file.write(data)
+
+    def __getattr__(self, name: str):
+        return getattr(self._file, name)
+
+
+class UploadRequest(Request):
+    """
+    Request that streams uploaded files straight into a new workspace
+    instead of Werkzeug's default in-memory/temp-file spooling.
+    """
+
+    workspace: Workspace | None = None
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.workspace is None:
+            self.workspace = get_workspaces().create()
+        return _UploadSink(self.workspace.path / f"upload-{len(list(self.workspace.path.iterdir()))}")
 
 
 app = Flask(__name__)
+app.request_class = UploadRequest
+app.config.update(
+    JOB_DB_PATH=str(Path(tempfile.gettempdir()) / "lead_pipeline_jobs.db"),
+    MAX_CONCURRENT_JOBS=2,
+    MAX_QUEUED_JOBS=8,
+    MAX_CONTENT_LENGTH=25 * 1024 * 1024,
+    WORKSPACE_ROOT=str(Path(tempfile.gettempdir()) / "lead_pipeline_workspaces"),
+    WORKSPACE_TTL_SECONDS=6 * 3600,
+)
+metrics_registry = MetricsRegistry()
+_job_queue: JobQueue | None = None
+_workspaces: WorkspaceManager | None = None
+_lazy_lock = threading.Lock()
 
 
 INDEX_TEMPLATE = """
@@ -385,8 +448,12 @@ RESULT_TEMPLATE = """
     </table>
     <div class="actions">
       <a href="/" class="button-link primary">Upload another file</a>
+      {% for name in downloads %}
+      <a href="/jobs/{{ job_id }}/files/{{ name }}" class="button-link">{{ name }}</a>
+      {% endfor %}
     </div>
     <div class="footer">
+      {% if expires %}Downloads are available until {{ expires }}.{% endif %}
       All operations are mocked for the assignment: CRM and email calls are simulated, not sent to real services.
     </div>
   </div>
@@ -395,40 +462,287 @@ RESULT_TEMPLATE = """
 """
 
 
+PROGRESS_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8" />
+  <title>Lead Pipeline – Running</title>
+  <style>
+    body {
+      font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
+      background: radial-gradient(circle at top left, #1d4ed8 0%, #020617 55%, #000000 100%);
+      color: #e5e7eb;
+      min-height: 100vh;
+      margin: 0;
+      padding: 2rem 1.5rem;
+      display: flex;
+      justify-content: center;
+      align-items: center;
+    }
+    .card {
+      max-width: 520px;
+      width: 100%;
+      background: rgba(15, 23, 42, 0.95);
+      border-radius: 1.25rem;
+      padding: 1.75rem 2rem;
+      box-shadow: 0 24px 60px rgba(15, 23, 42, 0.85);
+      border: 1px solid rgba(148, 163, 184, 0.35);
+    }
+    h1 {
+      margin-top: 0;
+      font-size: 1.5rem;
+      letter-spacing: 0.04em;
+    }
+    .subtitle {
+      color: #9ca3af;
+      margin-bottom: 1.25rem;
+      font-size: 0.95rem;
+    }
+    .bar-bg {
+      width: 100%;
+      height: 0.6rem;
+      border-radius: 999px;
+      background: rgba(15, 23, 42, 0.9);
+      border: 1px solid rgba(55, 65, 81, 0.85);
+      overflow: hidden;
+    }
+    .bar-fill {
+      height: 100%;
+      width: 0%;
+      border-radius: inherit;
+      background: linear-gradient(90deg, #22c55e, #a3e635);
+      transition: width 0.4s ease;
+    }
+    .counts {
+      margin-top: 1rem;
+      font-size: 0.9rem;
+      color: #9ca3af;
+      font-variant-numeric: tabular-nums;
+    }
+    .error {
+      margin-top: 0.75rem;
+      color: #fecaca;
+      font-size: 0.85rem;
+    }
+  </style>
+</head>
+<body>
+  <div class="card">
+    <h1>Processing leads…</h1>
+    <div class="subtitle">This page updates itself and shows the summary when the run finishes.</div>
+    <div class="bar-bg"><div class="bar-fill" id="bar"></div></div>
+    <div class="counts" id="counts">Cleaning the upload…</div>
+    <div class="error" id="error"></div>
+  </div>
+  <script>
+    async function poll() {
+      const response = await fetch("/jobs/{{ job_id }}");
+      if (!response.ok) {
+        document.getElementById("error").textContent = "Job not found.";
+        return;
+      }
+      const job = await response.json();
+      if (job.status === "succeeded") {
+        window.location = "/runs/{{ job_id }}";
+        return;
+      }
+      if (job.status === "failed") {
+        document.getElementById("error").textContent = "Pipeline failed: " + job.error;
+        return;
+      }
+      if (job.status === "queued") {
+        document.getElementById("counts").textContent = "Waiting for a free worker…";
+      }
+      const run = job.progress;
+      if (run && run.cleaned_leads > 0) {
+        const counts = run.counts;
+        const pct = Math.min(100, Math.round((run.processed / run.cleaned_leads) * 100));
+        document.getElementById("bar").style.width = pct + "%";
+        document.getElementById("counts").textContent =
+          run.processed + " / " + run.cleaned_leads + " leads processed · " +
+          counts.successful_crm_updates + " in CRM · " + counts.emails_sent + " emails sent · " +
+          (counts.failed_crm_updates + counts.email_failures) + " failures · " +
+          run.elapsed_seconds.toFixed(1) + "s";
+      }
+      setTimeout(poll, 1000);
+    }
+    poll();
+  </script>
+</body>
+</html>
+"""
+
+
+def get_job_queue() -> JobQueue:
+    """
+    The app's job queue, created on first use from ``app.config``.
+    """
+    global _job_queue
+    with _lazy_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(
+                Path(app.config["JOB_DB_PATH"]),
+                max_concurrent=app.config["MAX_CONCURRENT_JOBS"],
+                max_queued=app.config["MAX_QUEUED_JOBS"],
+                metrics=metrics_registry,
+            )
+        return _job_queue
+
+
+def get_workspaces() -> WorkspaceManager:
+    """
+    The app's upload workspaces, created on first use from ``app.config``.
+    """
+    global _workspaces
+    with _lazy_lock:
+        if _workspaces is None:
+            _workspaces = WorkspaceManager(
+                Path(app.config["WORKSPACE_ROOT"]),
+                ttl_seconds=app.config["WORKSPACE_TTL_SECONDS"],
+            )
+        return _workspaces
+
+
+def _render_result(data: dict, job_id: str):
+    max_value = max(data.values()) if data else 1
+    metrics = []
+    for key, value in data.items():
+        width_pct = 0 if max_value == 0 else int((value / max_value) * 100)
+        metrics.append((key.replace("_", " "), value, width_pct))
+
+    workspace = get_workspaces().get(job_id)
+    downloads = [name for name in DOWNLOADS if workspace is not None and (workspace.path / name).exists()]
+    expires = None
+    if downloads:
+        expires = datetime.fromtimestamp(get_workspaces().expires_at(workspace)).strftime("%Y-%m-%d %H:%M")
+
+    return render_template_string(RESULT_TEMPLATE, metrics=metrics, job_id=job_id, downloads=downloads, expires=expires)
+
+
+def _upload_error(message: str, status: int = 200):
+    # Drop whatever this request already streamed to disk
+    if request.workspace is not None:
+        get_workspaces().discard(request.workspace)
+    return render_template_string(INDEX_TEMPLATE, error=message), status
+
+
+def _wants_json() -> bool:
+    best = request.accept_mimetypes.best_match(["application/json", "text/html"])
+    return best == "application/json" and request.accept_mimetypes[best] > request.accept_mimetypes["text/html"]
+
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     if request.method == "GET":
         return render_template_string(INDEX_TEMPLATE, error=None)
 
-    uploaded = request.files.get("file")
+    # Refuse early when the queue is full, before reading the upload
+    job_queue = get_job_queue()
+    if job_queue.active >= job_queue.max_concurrent + job_queue.max_queued:
+        return _queue_full_response()
+    get_workspaces().maybe_sweep(keep=job_queue.active_ids())
+
+    # Parsing the form streams the file into a new workspace (UploadRequest)
+    try:
+        uploaded = request.files.get("file")
+    except RequestEntityTooLarge:
+        limit_mb = app.config["MAX_CONTENT_LENGTH"] / (1024 * 1024)
+        return _upload_error(f"File is larger than the {limit_mb:g} MB upload limit.", 413)
+    except UnsupportedMediaType:
+        return _upload_error("File must be an .xlsx Excel workbook.", 415)
+
     if not uploaded or uploaded.filename == "":
-        return render_template_string(INDEX_TEMPLATE, error="Please choose an Excel (.xlsx) file.")
+        return _upload_error("Please choose an Excel (.xlsx) file.")
 
     if not uploaded.filename.lower().endswith(".xlsx"):
-        return render_template_string(INDEX_TEMPLATE, error="File must be an .xlsx Excel workbook.")
+        return _upload_error("File must be an .xlsx Excel workbook.")
 
-    # Save the uploaded Excel to a temporary directory
-    tmp_dir = Path(tempfile.mkdtemp(prefix="leads_upload_"))
-    input_path = tmp_dir / "leads.xlsx"
-    uploaded.save(input_path)
+    workspace = request.workspace
+    input_path = workspace.path / "leads.xlsx"
+    uploaded.stream.close()
+    os.replace(uploaded.stream.name, input_path)
 
-    cleaned_path = tmp_dir / "cleaned_leads.xlsx"
-    report_path = tmp_dir / "report.json"
+    cleaned_path = workspace.path / "cleaned_leads.xlsx"
+    report_path = workspace.path / "report.json"
 
-    stats = run_pipeline(
-        input_excel=input_path,
-        cleaned_excel=cleaned_path,
-        report_path=report_path,
-    )
+    try:
+        job_id = job_queue.submit(input_path, cleaned_path, report_path, job_id=workspace.id)
+    except QueueFull:
+        get_workspaces().discard(workspace)
+        return _queue_full_response()
 
-    data = stats.to_dict()
-    max_value = max(data.values()) if data else 1
-    metrics = []
-    for key, value in data.items():
-        width_pct = 0 if max_value == 0 else int((value / max_value) * 100)
-        metrics.append((key.replace("_", " "), value, width_pct))
+    if _wants_json():
+        response = jsonify(job_id=job_id, status_url=f"/jobs/{job_id}", result_url=f"/jobs/{job_id}/result")
+        response.status_code = 202
+        response.headers["Location"] = f"/jobs/{job_id}"
+        return response
+    return redirect(f"/runs/{job_id}", code=303)
 
-    return render_template_string(RESULT_TEMPLATE, metrics=metrics)
+
+def _queue_full_response():
+    message = "The pipeline is busy with other uploads. Please try again in a minute."
+    if _wants_json():
+        response = jsonify(error=message)
+    else:
+        response = app.make_response(render_template_string(INDEX_TEMPLATE, error=message))
+    response.status_code = 503
+    response.headers["Retry-After"] = "30"
+    return response
+
+
+@app.route("/runs/<job_id>")
+def run_page(job_id: str):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        abort(404)
+    if job.status == FAILED:
+        return render_template_string(INDEX_TEMPLATE, error=f"Pipeline failed: {job.error}")
+    if not job.finished:
+        return render_template_string(PROGRESS_TEMPLATE, job_id=job_id)
+    return _render_result(job.result or {}, job_id)
+
+
+@app.route("/jobs/<job_id>")
+def job_status(job_id: str):
+    job_queue = get_job_queue()
+    job = job_queue.get(job_id)
+    if job is None:
+        abort(404)
+    progress = job_queue.progress(job_id)
+    return jsonify(**job.to_dict(), progress=progress.snapshot() if progress is not None else None)
+
+
+@app.route("/jobs/<job_id>/result")
+def job_result(job_id: str):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        abort(404)
+    if job.status == SUCCEEDED:
+        return jsonify(**job.to_dict(), result=job.result)
+    # Not finished yet (202) or failed (500); the body has the status either way
+    return jsonify(**job.to_dict()), 500 if job.status == FAILED else 202
+
+
+@app.route("/jobs/<job_id>/files/<name>")
+def job_file(job_id: str, name: str):
+    if name not in DOWNLOADS:
+        abort(404)
+    job = get_job_queue().get(job_id)
+    if job is None:
+        abort(404)
+    if job.status != SUCCEEDED:
+        return jsonify(**job.to_dict()), 409
+    workspace = get_workspaces().get(job_id)
+    if workspace is None or not (workspace.path / name).exists():
+        # Expired and swept
+        abort(410)
+    return send_file(workspace.path / name, as_attachment=True, download_name=name)
+
+
+@app.route("/metrics")
+def metrics():
+    return Response(metrics_registry.render(), mimetype="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
@@ -436,6 +750,24 @@ if __name__ == "__main__":
     p = argparse.ArgumentParser()
     p.add_argument("--port", type=int, default=5000)
     p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--max-jobs", type=int, default=app.config["MAX_CONCURRENT_JOBS"], help="Pipeline runs at once.")
+    p.add_argument(
+        "--max-queued", type=int, default=app.config["MAX_QUEUED_JOBS"], help="Uploads waiting before new ones get 503."
+    )
+    p.add_argument("--job-db", default=app.config["JOB_DB_PATH"], help="SQLite file for the job table.")
+    p.add_argument("--max-upload-mb", type=float, default=25.0, help="Largest accepted upload.")
+    p.add_argument("--workspace-dir", default=app.config["WORKSPACE_ROOT"], help="Where uploads and outputs live.")
+    p.add_argument(
+        "--workspace-ttl-hours", type=float, default=6.0, help="How long outputs stay downloadable."
+    )
     args = p.parse_args()
+    app.config.update(
+        JOB_DB_PATH=args.job_db,
+        MAX_CONCURRENT_JOBS=args.max_jobs,
+        MAX_QUEUED_JOBS=args.max_queued,
+        MAX_CONTENT_LENGTH=int(args.max_upload_mb * 1024 * 1024),
+        WORKSPACE_ROOT=args.workspace_dir,
+        WORKSPACE_TTL_SECONDS=args.workspace_ttl_hours * 3600,
+    )
     app.run(debug=True, host=args.host, port=args.port)
 